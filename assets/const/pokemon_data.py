@@ -4,3 +4,10 @@ POKE_BALLS_LIST = [
     "master_ball", "nest_ball", "types_ball", "stats_ball", "timers_ball", "ultra_ball", "friend_ball",
     "repeat_ball", "great_ball", "cherish_ball", "stone_ball", "clone_ball", "level_ball", "poke_ball"
 ]
+
+# Config ball groups and the actual balls each one stands for
+POKE_BALL_GROUPS = {
+    "types_ball": ("net_ball", "phantom_ball", "night_ball", "frozen_ball", "cipher_ball", "magnet_ball", "fantasy_ball", "geo_ball"),
+    "stats_ball": ("heavy_ball", "feather_ball", "heal_ball", "fast_ball"),
+    "timers_ball": ("quick_ball", "timer_ball"),
+}
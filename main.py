@@ -1,20 +1,40 @@
 import sys
 import os
 import asyncio
+import logging
+import queue
 import qasync
+from logging.handlers import QueueHandler, QueueListener
 from os import path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# LOG_LEVEL=DEBUG (env or .env) shows the verbose application logs
+# Records are queued and written to the console by a listener thread, so logging never waits on I/O in the event loop
+log_queue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+# An unknown level name would make basicConfig raise, so it falls back to INFO instead
+if not isinstance(logging.getLevelName(log_level), int):
+    log_level = "INFO"
+logging.basicConfig(level=log_level, handlers=[queue_handler])
+log_listener = QueueListener(log_queue, logging.StreamHandler())
+
 from PyQt6.QtWebEngineCore import QWebEngineUrlScheme
 from PyQt6.QtWidgets import QApplication
 
 from src.MainApplication.index import MainApplication
 
-# Fix for Wayland/GPU issues
-os.environ["QT_QPA_PLATFORM"] = "xcb"
-os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--disable-gpu"
+# Fix for Wayland/GPU issues. Other sessions keep Qt defaults so WebEngine can render with the GPU.
+# Set FORCE_DISABLE_GPU=1 (env or .env) to always render in software.
+if os.environ.get("XDG_SESSION_TYPE") == "wayland" or os.environ.get("WAYLAND_DISPLAY"):
+    os.environ["QT_QPA_PLATFORM"] = "xcb"
+    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--disable-gpu"
+
+elif os.environ.get("FORCE_DISABLE_GPU") == "1":
+    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--disable-gpu"
 
 
 def except_hook(cls, exception, traceback):
@@ -39,14 +59,15 @@ async def main():
     program_path = get_program_path(__file__)
     core_app = MainApplication(program_path)
     
-    # We await the core_app so the event loop stays alive
-    # We will need to implement a run/shutdown method in MainApplication
+    # We await the core_app so the event loop stays alive.
+    # Qt and asyncio share the qasync loop, so nothing here polls.
     await core_app.run()
 
 
 if __name__ == "__main__":
 
     sys.excepthook = except_hook
+    log_listener.start()
 
     scheme = QWebEngineUrlScheme(b"qt")
     QWebEngineUrlScheme.registerScheme(scheme)
@@ -62,3 +83,4 @@ if __name__ == "__main__":
         pass
     finally:
         loop.close()
+        log_listener.stop()
@@ -1,4 +1,4 @@
-from json import loads
+from json import loads, dumps
 
 from PyQt6.QtCore import QUrl, pyqtSlot, QRect, QObject
 from PyQt6.QtGui import QIcon, QGuiApplication
@@ -31,6 +31,10 @@ class ConfigPage(QWebEngineView):
     It is used to set not configurations as which balls throw and when to buy.
     """
 
+    # Shared between instances so the icon is decoded and the screen queried only once
+    _cached_icon = None
+    _cached_center_point = None
+
     def __init__(self,
                  program_path,
                  on_load_callback,
@@ -60,12 +64,15 @@ class ConfigPage(QWebEngineView):
         self.setPage(self._page)
 
         self.setWindowTitle("Config")
-        self.setWindowIcon(QIcon(f"{self._program_path}/assets/icons/gear.png"))
+        if ConfigPage._cached_icon is None:
+            ConfigPage._cached_icon = QIcon(f"{self._program_path}/assets/icons/gear.png")
+        self.setWindowIcon(ConfigPage._cached_icon)
 
         self.setGeometry(QRect(0, 0, 960, 640)) 
-        center_point = QGuiApplication.primaryScreen().availableGeometry().center()
+        if ConfigPage._cached_center_point is None:
+            ConfigPage._cached_center_point = QGuiApplication.primaryScreen().availableGeometry().center()
         qt_rectangle = self.frameGeometry()
-        qt_rectangle.moveCenter(center_point)
+        qt_rectangle.moveCenter(ConfigPage._cached_center_point)
         self.move(qt_rectangle.topLeft())
 
     def open(self):
@@ -80,5 +87,6 @@ class ConfigPage(QWebEngineView):
     def update_config_data(self, new_value):
         """Updates GUI config in page js store via qt channel"""
 
-        self._page.runJavaScript(f"runSetConfig('{new_value}')")
+        # dumps turns the payload into a safely escaped JS string literal, whatever quotes it contains
+        self._page.runJavaScript(f"runSetConfig({dumps(new_value)})")
 
@@ -1,35 +1,38 @@
 from assets.const.pokemon_data import POKE_BALLS_LIST
 
 
+# Hashed view of the accepted ball names, so str_list validation does O(1) membership tests
+POKE_BALLS_SET = frozenset(POKE_BALLS_LIST)
+
 # Optimal Economic Defaults
 # S: Everything (Catch at all costs)
-uncapt_S_default = [b for b in POKE_BALLS_LIST if b != "repeat_ball"]
-S_default = POKE_BALLS_LIST
+uncapt_S_default = tuple(b for b in POKE_BALLS_LIST if b != "repeat_ball")
+S_default = tuple(POKE_BALLS_LIST)
 
 # A: High Value, but maybe save Master. Use Ultra/Specials.
 # Economy: Avoid waste, but A tier is valuable.
 A_balls = ["ultra_ball", "great_ball", "timer_ball", "quick_ball", 
            "level_ball", "lure_ball", "moon_ball", "friend_ball", "love_ball", "fast_ball", "heavy_ball", 
            "net_ball", "dive_ball", "nest_ball", "repeat_ball", "dusk_ball", "luxury_ball", "premier_ball"]
-uncapt_A_default = [b for b in A_balls if b != "repeat_ball"]
-A_default = A_balls
+uncapt_A_default = tuple(b for b in A_balls if b != "repeat_ball")
+A_default = tuple(A_balls)
 
 # B: Medium Value. Great Ball is workhorse. Ultra if needed.
 # Economy: Prefer Great Ball (Cost 600) over Ultra (1000) unless necessary.
 B_balls = ["great_ball", "timer_ball", "quick_ball", "net_ball", "dive_ball", "dusk_ball", "nest_ball", "repeat_ball"]
-uncapt_B_default = [b for b in B_balls if b != "repeat_ball"] + ["ultra_ball"] # Boost for new entry
-B_default = B_balls
+uncapt_B_default = tuple(b for b in B_balls if b != "repeat_ball") + ("ultra_ball",) # Boost for new entry
+B_default = tuple(B_balls)
 
 # C: Low Value. Poke Ball only mostly.
 # LogicDealer already restricts Great Ball usage for C tier based on cash.
 C_balls = ["poke_ball", "great_ball", "premier_ball"]
-uncapt_C_default = ["poke_ball", "great_ball", "premier_ball", "timer_ball", "quick_ball"] # Boost for new entry
-C_default = C_balls
+uncapt_C_default = ("poke_ball", "great_ball", "premier_ball", "timer_ball", "quick_ball") # Boost for new entry
+C_default = tuple(C_balls)
 
 # M (Mission): Catch based on requirement, but usually any ball fails if not matched.
 # Safest is to allow all except Master.
-M_default = [b for b in POKE_BALLS_LIST if b != "master_ball"]
-uncapt_M_default = [b for b in M_default if b != "repeat_ball"]
+M_default = tuple(b for b in POKE_BALLS_LIST if b != "master_ball")
+uncapt_M_default = tuple(b for b in M_default if b != "repeat_ball")
 
 
 config_validator = {
@@ -98,43 +101,43 @@ config_validator = {
         },
         "uncapt_S": {
             "default": uncapt_S_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "S": {
             "default": S_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "uncapt_M": {
             "default": uncapt_M_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "M": {
             "default": M_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "uncapt_A": {
             "default": uncapt_A_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "A": {
             "default": A_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "uncapt_B": {
             "default": uncapt_B_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "B": {
             "default": B_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "uncapt_C": {
             "default": uncapt_C_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
         "C": {
             "default": C_default,
-            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_LIST}
+            "validator": {"type": "str_list", "accepted_values": POKE_BALLS_SET}
         },
     },
     "stats_balls": {
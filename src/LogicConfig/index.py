@@ -1,9 +1,11 @@
-from json import dump
+from json import dump, dumps
 
 from PyQt6.QtCore import QObject
 
 from src.LogicConfig.load_conf_file import load_conf_file
 
+from assets.const.pokemon_data import POKE_BALL_GROUPS
+
 
 class LogicConfig(QObject):
     """
@@ -24,6 +26,8 @@ class LogicConfig(QObject):
         self.theme_callback = None
 
         self.config = dict()
+        self.catch_candidates = dict()
+        self._config_json = None # Serialized GUI config, rebuilt lazily after a change
 
         self.load()
 
@@ -31,6 +35,24 @@ class LogicConfig(QObject):
         """Loads initial conf file. It will create one if it does not exist"""
 
         self.config = load_conf_file(self._file_path)
+        self._config_json = None
+        self._compile_catch_config()
+
+    def _compile_catch_config(self):
+        """Expands each catch tier into its ball candidates, so spawns do not redo it"""
+
+        self.catch_candidates = dict()
+
+        for tier, balls in self.config["catch"].items():
+            if not isinstance(balls, (list, tuple)):
+                continue
+
+            # Ball groups are expanded in config order, keeping the first occurrence of each ball
+            candidates = dict()
+            for ball_key in balls:
+                for ball in POKE_BALL_GROUPS.get(ball_key, (ball_key,)):
+                    candidates.setdefault(ball)
+            self.catch_candidates[tier] = tuple(candidates)
 
     def update(self, new_json):
         """Updates conf file saving it to json and reloading it"""
@@ -50,7 +72,25 @@ class LogicConfig(QObject):
         if new_config.get("theme") != self.config.get("theme") and self.theme_callback:
             self.theme_callback(new_config["theme"])
 
+        if new_config != self.config:
+            self._config_json = None
+
         self.config = new_config
+        self._compile_catch_config()
+
+    @property
+    def config_json(self):
+        """Config values shown by the config page, serialized once per change"""
+        if self._config_json is None:
+            self._config_json = dumps({
+                "language": self.language,
+                "theme": self.theme,
+                "channel": self.channel,
+                "shop": self.shop,
+                "catch": self.catch,
+                "stats_balls": self.stats_balls,
+            })
+        return self._config_json
 
     @property
     def language(self):
@@ -116,7 +116,8 @@ def validate_str_list_value(value, default_value, validator):
     """Validates string list attributes"""
 
     if not isinstance(value, list) or value is None:
-        return default_value
+        # Defaults are kept as tuples, each config gets its own list like a value read from the file
+        return list(default_value)
 
     accepted_values = validator.get("accepted_values")
 
@@ -124,4 +125,4 @@ def validate_str_list_value(value, default_value, validator):
         return [item for item in value if isinstance(item, str)]
 
     else:
-        return [item for item in value if item in accepted_values]
+        return [item for item in value if isinstance(item, str) and item in accepted_values]
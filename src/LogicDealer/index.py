@@ -2,23 +2,39 @@ from datetime import datetime, timedelta
 from math import floor
 from random import randint
 import asyncio
+import heapq
+import logging
 
 from dateutil import tz
 
 from assets.const.bot_status import BOT_STATUS
+from assets.const.pokemon_data import POKE_BALLS_LIST
 
 from src.helpers.DiscordManager import DiscordManager
 
+log = logging.getLogger(__name__)
+
+# Timezone does not change while the bot runs, so we resolve it only once
+_LOCAL_TZ = tz.tzlocal()
+
+
+def _now():
+    """Current timezone aware local time"""
+
+    return datetime.now(tz=_LOCAL_TZ)
+
 
 class LogicDealer:
     # ...
 
-    def __init__(self, logic_config, pokemon_data, last_spawn_data_callback, socket_send_chat_message):
+    def __init__(self, logic_config, pokemon_data, last_spawn_data_callback, socket_send_chat_message, spawn_state_callback):
 
         self._logic_config = logic_config
         self._pokemon_data = pokemon_data
         self._spawn_data_callback = last_spawn_data_callback
         self._socket_send_chat_message = socket_send_chat_message
+        # Called whenever the last spawn changes, so the main loop recomputes when spawn_routine is due
+        self._spawn_state_callback = spawn_state_callback
         
         self.discord_manager = DiscordManager(logic_config)
 
@@ -34,19 +50,26 @@ class LogicDealer:
         """Handle a pokemon spawn after spawn data has been set"""
 
         pokemon_data = spawn_data["pokemon_data"]
+        tier = pokemon_data["tier"]
 
-        if pokemon_data["tier"] != "S" and self._check_spawn_is_mission(pokemon_data):
-            pokemon_data["tier"] = "M"
+        if tier != "S" and self._check_spawn_is_mission(pokemon_data):
+            tier = "M"
 
-        if pokemon_data["pokedex_id"] not in self._pokemon_data.captured["unique_captured_ids"]:
+        if pokemon_data["pokedex_id"] not in self._pokemon_data.captured["pokemon_by_id"]:
             if not self._logic_config.catch.get("treat_uncapt_as_capt", False):
-                pokemon_data["tier"] = f"uncapt_{pokemon_data['tier']}"
+                tier = f"uncapt_{tier}"
+
+        pokemon_data["tier"] = tier
 
-        chosen_ball = await self._choose_capture_ball(pokemon_data) if should_capture else None
+        catch_deadline = spawn_data["datetime"] + timedelta(minutes=1)
+        chosen_ball = await self._choose_capture_ball(pokemon_data, catch_deadline) if should_capture else None
+
+        name = pokemon_data["name"]
+        types_str = ", ".join(t for t in pokemon_data["types"] if t)
 
         if chosen_ball is not None:
 
-            print(f"A wild {pokemon_data['name']} (Tier: {pokemon_data['tier']}) (Types: {', '.join([t for t in pokemon_data['types'] if t])}) appeared! Using {chosen_ball} to attempt capture.")
+            log.info("A wild %s (Tier: %s) (Types: %s) appeared! Using %s to attempt capture.", name, tier, types_str, chosen_ball)
 
             await sleep_before_catch(spawn_data["datetime"], chosen_ball)
             self._send_catch_command(chosen_ball)
@@ -55,17 +78,18 @@ class LogicDealer:
                 self._last_spawn["attempt_catch"] = True
 
         else:
-            print(f"Wild {pokemon_data['name']} (Tier: {pokemon_data['tier']}) (Types: {', '.join([t for t in pokemon_data['types'] if t])}) appeared, but no ball was chosen (or capture disabled).")
+            log.info("Wild %s (Tier: %s) (Types: %s) appeared, but no ball was chosen (or capture disabled).", name, tier, types_str)
 
         if self.last_spawn is not None:
             self._last_spawn["updated_data_after_spawn"] = False
+            self._spawn_state_callback()
 
     def _send_chat_message(self, command):
         """Uses socket function to send a message to chat"""
 
         self._last_chat_interaction = datetime.now()
 
-        print(f"Sending chat message: '{command}'")
+        log.info("Sending chat message: '%s'", command)
         self._socket_send_chat_message(command)
 
     def _send_catch_command(self, ball):
@@ -75,8 +99,7 @@ class LogicDealer:
              self._send_chat_message("!pokecatch")
              return
 
-        ball_name = ball.replace("_", " ")
-        self._send_chat_message(f"!pokecatch {ball_name}")
+        self._send_chat_message(f"!pokecatch {get_ball_display_name(ball)}")
 
     def spawn_routine(self, bot_status):
         """Main routine to be run after a spawn. It listens to new spawns, updates pokemon data and keeps chat active"""
@@ -86,12 +109,24 @@ class LogicDealer:
             return
 
         next_spawn_date: datetime = self.last_spawn["datetime"] + timedelta(minutes=15)
-        time_to_next_spawn = next_spawn_date - datetime.now(tz=tz.tzlocal())
+        time_to_next_spawn = next_spawn_date - _now()
 
         if time_to_next_spawn < timedelta(minutes=13, seconds=20) and not self.last_spawn["updated_data_after_spawn"]:
             self._last_spawn["updated_data_after_spawn"] = True
             self._pokemon_data.update_data()
 
+    def next_routine_delay(self):
+        """Seconds until spawn_routine has work to do. Chat spawns are handled by their own callback"""
+
+        if self.last_spawn is None:
+            return 1
+
+        if self.last_spawn["updated_data_after_spawn"]:
+            return float("inf")
+
+        update_date: datetime = self.last_spawn["datetime"] + timedelta(minutes=1, seconds=40)
+        return (update_date - _now()).total_seconds()
+
     def investigate_last_spawn(self, bot_status, chat_message=None):
         """Investigates the last spawn"""
 
@@ -103,9 +138,7 @@ class LogicDealer:
 
         spawn_data = await self._pokemon_data.get_last_spawn_data()
 
-        started_time = datetime.now()
-        while len(self._pokemon_data.pokedex["dex"]) == 0 and datetime.now() - started_time < timedelta(seconds=20):
-            await asyncio.sleep(1)
+        await self._pokemon_data.wait_for_pokedex(timeout=20)
 
         should_capture = bot_status == BOT_STATUS["ACTIVE"]
 
@@ -118,12 +151,12 @@ class LogicDealer:
     async def _handle_spawn_from_server(self, last_spawn_data, should_capture):
         """Handles spawn using data from pokemon API"""
 
-        print("Handling spawn from server data.")
+        log.info("Handling spawn from server data.")
 
         pokemon_data = await self._pokemon_data.get_pokemon_data(last_spawn_data["pokedex_id"])
 
         if pokemon_data is None:
-            print(f"Error: Could not retrieve data for pokemon ID {last_spawn_data['pokedex_id']}. Spawn ignored.")
+            log.error("Could not retrieve data for pokemon ID %s. Spawn ignored.", last_spawn_data["pokedex_id"])
             return
 
         self._last_spawn = {
@@ -135,6 +168,7 @@ class LogicDealer:
             "checked_pokemon": False,
             "talked_in_chat_after_spawn": False,
         }
+        self._spawn_state_callback()
 
         spawn_data = {
             "datetime": last_spawn_data["spawn_date"],
@@ -148,22 +182,22 @@ class LogicDealer:
         })
         self._sleep_before_talking = randint(0, 30)
 
-        if (datetime.now(tz=tz.tzlocal()) - spawn_data["datetime"]).total_seconds() < 90:
+        if (_now() - spawn_data["datetime"]).total_seconds() < 90:
             await self._handle_spawn(spawn_data, should_capture)
 
     async def _handle_spawn_from_chat(self, chat_message, should_capture):
         """Handles spawn using message from chat"""
 
-        print("Handling spawn from chat message.")
+        log.info("Handling spawn from chat message.")
 
-        id_from_message = get_pokemon_id_from_chat_message(chat_message, self._pokemon_data.pokedex["dex"])
+        id_from_message = get_pokemon_id_from_chat_message(chat_message, self._pokemon_data.dex_names)
         pokemon_data = await self._pokemon_data.get_pokemon_data(id_from_message) if id_from_message is not None else None
 
         if pokemon_data is None:
             return
 
         spawn_data = {
-            "datetime": datetime.now(tz=tz.tzlocal()),
+            "datetime": _now(),
             "is_pcg_spawn": False,
             "pokemon_data": pokemon_data,
         }
@@ -174,266 +208,133 @@ class LogicDealer:
     def _check_spawn_is_mission(self, pokemon_data):
         """Checks if a pokemon spawn is required for any mission"""
 
-        for mission in self._pokemon_data.missions["target_missions"]:
+        for mission_op, mission_value in self._pokemon_data.missions["target_missions"]:
+            check = _MISSION_CHECKS.get(mission_op)
 
-            if mission[0] == "tier" and pokemon_data["tier"] == mission[1]:
+            if check is not None and check(pokemon_data, mission_value):
                 return True
 
-            elif mission[0] == "bst_greater" and pokemon_data["base_stats"] > mission[1]:
-                return True
+        return False
 
-            elif mission[0] == "bst_lower" and pokemon_data["base_stats"] < mission[1]:
-                return True
+    async def _choose_capture_ball(self, pokemon_data, catch_deadline):
+        """Chooses the best poke ball based on catch rate and economic value"""
 
-            elif mission[0] == "weight_greater" and pokemon_data["weight"] > mission[1]:
-                return True
+        tier = pokemon_data["tier"]
+        core_tier = tier.replace("uncapt_", "")
 
-            elif mission[0] == "weight_lower" and pokemon_data["weight"] < mission[1]:
-                return True
+        inventory = self._pokemon_data.inventory
+        inventory_items = inventory["sprite_names"]
+        cash = inventory["cash"]
 
-            elif mission[0] == "type_count" and len(pokemon_data["types"]) == mission[1]:
-                return True
+        candidate_balls = []
 
-            elif mission[0] == "type":
-                for pokemon_type in pokemon_data["types"]:
-                    if pokemon_type == mission[1]:
-                        return True
-                        
-        return False
+        for ball in self._logic_config.catch_candidates[tier]:
+            is_available, source = self._can_use_ball(ball, core_tier, inventory_items, cash)
+            if is_available:
+                score = self._calculate_ball_score(ball, pokemon_data)
 
-    async def _choose_capture_ball(self, pokemon_data):
-        """Chooses the best poke ball based on catch rate and economic value"""
+                candidate_balls.append({
+                    "ball": ball,
+                    "score": score,
+                    "source": source
+                })
 
-        available_balls = []
-        
-        if "poke_ball" in self._logic_config.catch[pokemon_data["tier"]]:
-            available_balls.append("poke_ball")
-        if "great_ball" in self._logic_config.catch[pokemon_data["tier"]]:
-            available_balls.append("great_ball")
-        if "ultra_ball" in self._logic_config.catch[pokemon_data["tier"]]:
-            available_balls.append("ultra_ball")
-        if "master_ball" in self._logic_config.catch[pokemon_data["tier"]]:
-            available_balls.append("master_ball")
-            
-        inventory_items = [item["sprite_name"] for item in self._pokemon_data.inventory["items"]]
-        
-        tier_config = self._logic_config.catch[pokemon_data["tier"]]
-        
-        best_ball = None
-        best_score = -1
-        
-        def can_use_ball(ball_name):
-            
-            core_tier = pokemon_data["tier"].replace("uncapt_", "")
-            
-            high_tier_balls = [
-                "ultra_ball", "quick_ball", "timer_ball", 
-                "heavy_ball", "feather_ball", "net_ball", "phantom_ball", 
-                "night_ball", "frozen_ball", "cipher_ball", "magnet_ball", 
-                "fantasy_ball", "geo_ball", "heal_ball", "fast_ball"
-            ]
-            
-            if ball_name in high_tier_balls:
-                if core_tier not in ["S", "A", "B"]:
-                    return False, "restricted_tier_low"
-
-            if core_tier == "C":
-                if ball_name == "great_ball":
-                    if self._pokemon_data.inventory["cash"] < 2000:
-                        return False, "restricted_cash_c"
-                elif ball_name != "poke_ball" and ball_name != "premier_ball":
-                     return False, "restricted_tier_c"
-
-            if ball_name in inventory_items:
-                return True, "inventory"
-            
-            if ball_name in ["poke_ball", "great_ball", "ultra_ball"]:
-                cash = self._pokemon_data.inventory["cash"]
-                
-                if ball_name == "great_ball":
-                    limit = 2000 if core_tier == "C" else 900
-                    if cash <= limit:
-                         return False, "restricted_cash"
-                        
-                if ball_name == "ultra_ball":
-                    if core_tier not in ["S", "A"]:
-                         return False, "restricted_tier"
-                    if cash <= 1500: 
-                         return False, "restricted_cash"
-                
-                if ball_name in self._logic_config.shop:
-                     return True, "shop"
-                     
-            return False, "unavailable"
-
-        from assets.const.pokemon_data import POKE_BALLS_LIST
-        
-        candidate_balls = []
+        # Best candidate plus a runner-up in case buying the best one fails
+        top_candidates = heapq.nlargest(2, candidate_balls, key=_rank_candidate)
 
-        for ball_key in tier_config:
-            
-            actual_balls_to_check = []
-            
-            if ball_key == "types_ball":
-                actual_balls_to_check.extend(["net_ball", "phantom_ball", "night_ball", "frozen_ball", "cipher_ball", "magnet_ball", "fantasy_ball", "geo_ball"])
-            elif ball_key == "stats_ball":
-                actual_balls_to_check.extend(["heavy_ball", "feather_ball", "heal_ball", "fast_ball"])
-            elif ball_key == "timers_ball":
-                actual_balls_to_check.extend(["quick_ball", "timer_ball"])
-            else:
-                actual_balls_to_check.append(ball_key)
-                
-            for ball in actual_balls_to_check:
-                is_available, source = can_use_ball(ball)
-                if is_available:
-                    score = self._calculate_ball_score(ball, pokemon_data)
-                    
-                    candidate_balls.append({
-                        "ball": ball,
-                        "score": score,
-                        "source": source
-                    })
-
-        def get_ball_cost(ball_name):
-            if ball_name == "poke_ball": return 300
-            if ball_name == "great_ball": return 600
-            if ball_name == "ultra_ball": return 1000
-            return 2000
-        
-        candidate_balls.sort(key=lambda x: (x["score"], x["source"] == "inventory", -get_ball_cost(x["ball"])), reverse=True)
-        
-        if not candidate_balls:
+        if not top_candidates:
             return None
-            
-        best_choice = candidate_balls[0]
+
+        best_choice = top_candidates[0]
         ball = best_choice["ball"]
-        
+
         if best_choice["source"] == "shop":
-            if await self.handle_purchase_balls(ball):
+            if await self.handle_purchase_balls(ball, catch_deadline):
                 return ball
-            else:
-                candidate_balls.pop(0)
-                if candidate_balls:
-                    return candidate_balls[0]["ball"]
-                return None
-                
+            elif len(top_candidates) > 1:
+                return top_candidates[1]["ball"]
+            return None
+
         return ball
 
+    def _can_use_ball(self, ball_name, core_tier, inventory_items, cash):
+        """Checks if a ball may be thrown for a tier, returning (is_available, source)"""
+
+        if ball_name in _HIGH_TIER_BALLS and core_tier not in _HIGH_TIERS:
+            return False, "restricted_tier_low"
+
+        if core_tier == "C":
+            if ball_name == "great_ball":
+                if cash < 2000:
+                    return False, "restricted_cash_c"
+            elif ball_name not in _C_TIER_BALLS:
+                return False, "restricted_tier_c"
+
+        if ball_name in inventory_items:
+            return True, "inventory"
+
+        if ball_name in _SHOP_BALLS:
+
+            if ball_name == "great_ball":
+                limit = 2000 if core_tier == "C" else 900
+                if cash <= limit:
+                    return False, "restricted_cash"
+
+            if ball_name == "ultra_ball":
+                if core_tier not in ("S", "A"):
+                    return False, "restricted_tier"
+                if cash <= 1500:
+                    return False, "restricted_cash"
+
+            if ball_name in self._logic_config.shop:
+                return True, "shop"
+
+        return False, "unavailable"
+
     def _calculate_ball_score(self, ball, pokemon_data):
         """Calculates a catch score (0-100+) for a given ball and pokemon"""
-        
-        score = 0
-        
-        if ball == "poke_ball": score = 30
-        elif ball == "great_ball": score = 55
-        elif ball == "ultra_ball": score = 80
-        elif ball == "master_ball": score = 1000
-        
-        elif ball == "premier_ball": score = 30 
-        elif ball == "cherish_ball": score = 30 
-        elif ball == "great_cherish_ball": score = 55
-        elif ball == "ultra_cherish_ball": score = 80
-        
-        elif ball == "heavy_ball":
-            w = pokemon_data.get("weight", 0)
-            if w > 400: score = 80 
-            elif w > 200: score = 50
-            else: score = 20
-            
-        elif ball == "feather_ball":
-            w = pokemon_data.get("weight", 0)
-            if w < 50: score = 80 
-            elif w < 100: score = 50
-            else: score = 20
-        
-        elif ball == "net_ball":
-            if "water" in pokemon_data["types"] or "bug" in pokemon_data["types"]:
-                score = 70
-            else: score = 30
-            
-        elif ball == "phantom_ball":
-            score = 80 if "ghost" in pokemon_data["types"] else 30
-            
-        elif ball == "night_ball":
-            score = 80 if "dark" in pokemon_data["types"] else 30
-            
-        elif ball == "frozen_ball":
-            score = 80 if "ice" in pokemon_data["types"] else 30
-            
-        elif ball == "cipher_ball":
-            score = 70 if "poison" in pokemon_data["types"] or "psychic" in pokemon_data["types"] else 30
-            
-        elif ball == "magnet_ball":
-            score = 80 if "electric" in pokemon_data["types"] or "steel" in pokemon_data["types"] else 30
-
-        elif ball == "fantasy_ball":
-            score = 80 if "dragon" in pokemon_data["types"] or "fairy" in pokemon_data["types"] else 30
-
-        elif ball == "geo_ball":
-            score = 80 if "rock" in pokemon_data["types"] or "ground" in pokemon_data["types"] else 30
-            
-        elif ball == "heal_ball":
-             score = 80 if pokemon_data.get("base_hp", 0) >= self._logic_config.stats_balls["heal_ball"] else 20
-             
-        elif ball == "fast_ball":
-             score = 80 if pokemon_data.get("base_speed", 0) > self._logic_config.stats_balls["fast_ball"] else 20
-
-        elif ball == "quick_ball":
-            score = 90
-            
-        elif ball == "timer_ball":
-            score = 90 
-            
-        elif ball == "repeat_ball":
-            if "uncapt" not in pokemon_data["tier"]:
-                score = 75
-            else:
-                score = 30
-                
-        elif ball == "friend_ball" or ball == "buddy_ball":
-            score = 30
-            for t in pokemon_data["types"]:
-                if t in self._pokemon_data.captured["buddy_types"]:
-                    score = 70
-                    break
-
-        elif ball == "level_ball":
-            score = 50
-            
-        elif ball == "stone_ball":
-            score = 50
-
-        elif ball == "clone_ball":
-            score = 30
-            if pokemon_data["tier"] in ["S", "A"]:
-                score += 10 
-        
-        return score
 
-    async def handle_purchase_balls(self, ball):
-        """Purchase balls based on user's config"""
+        score = _BALL_BASE_SCORES.get(ball)
+        if score is not None:
+            return score
+
+        types = frozenset(pokemon_data["types"])
+
+        type_bonus = _TYPE_BALL_SCORES.get(ball)
+        if type_bonus is not None:
+            target_types, bonus_score = type_bonus
+            return bonus_score if types & target_types else 30
+
+        handler = _BALL_SCORE_HANDLERS.get(ball)
+        if handler is not None:
+            return handler(self, pokemon_data, types)
+
+        return 0
+
+    async def handle_purchase_balls(self, ball, catch_deadline):
+        """Purchase balls based on user's config. Waits are shortened so the catch deadline is not missed"""
 
         shop_config = self._logic_config.shop.get(ball, {})
-        if not shop_config: return False
-        
-        purchased = False
+        if not shop_config or not shop_config.get("buy_on_missing", False):
+            return False
 
-        await asyncio.sleep(randint(5, 10))  
+        remaining_time = (catch_deadline - _now()).total_seconds()
+        await asyncio.sleep(min(randint(5, 10), max(0, remaining_time - 2)))
 
-        if not shop_config.get("buy_on_missing", False):
-            purchased = False
+        purchased = False
 
-        elif self._pokemon_data.inventory["cash"] > shop_config.get("buy_ten", 999999):
-            self._send_chat_message(f"!pokeshop {ball.replace('_', ' ')} 10")
+        if self._pokemon_data.inventory["cash"] > shop_config.get("buy_ten", 999999):
+            self._send_chat_message(f"!pokeshop {get_ball_display_name(ball)} 10")
             purchased = True
 
         elif self._pokemon_data.inventory["cash"] > shop_config.get("buy_one", 999999):
-            self._send_chat_message(f"!pokeshop {ball.replace('_', ' ')}")
+            self._send_chat_message(f"!pokeshop {get_ball_display_name(ball)}")
             purchased = True
 
-        if purchased:
+        # Give the shop time to deliver, unless the catch window is already over
+        if purchased and _now() < catch_deadline:
             await asyncio.sleep(6)
-            
+
         return purchased
 
     @property
@@ -441,41 +342,169 @@ class LogicDealer:
         return self._last_spawn
 
 
-def get_pokemon_id_from_chat_message(chat_message, pokedex):
-    """"Finds out which pokemon spawned from a chat message"""
+def _score_heavy_ball(dealer, pokemon_data, types):
+    weight = pokemon_data.get("weight", 0)
+    if weight > 400: return 80
+    if weight > 200: return 50
+    return 20
+
+
+def _score_feather_ball(dealer, pokemon_data, types):
+    weight = pokemon_data.get("weight", 0)
+    if weight < 50: return 80
+    if weight < 100: return 50
+    return 20
+
+
+def _score_heal_ball(dealer, pokemon_data, types):
+    return 80 if pokemon_data.get("base_hp", 0) >= dealer._logic_config.stats_balls["heal_ball"] else 20
+
+
+def _score_fast_ball(dealer, pokemon_data, types):
+    return 80 if pokemon_data.get("base_speed", 0) > dealer._logic_config.stats_balls["fast_ball"] else 20
+
+
+def _score_repeat_ball(dealer, pokemon_data, types):
+    return 75 if "uncapt" not in pokemon_data["tier"] else 30
+
+
+def _score_friend_ball(dealer, pokemon_data, types):
+    return 70 if not types.isdisjoint(dealer._pokemon_data.captured["buddy_types"]) else 30
+
+
+def _score_clone_ball(dealer, pokemon_data, types):
+    return 40 if pokemon_data["tier"] in ("S", "A") else 30
+
+
+# Shop price of each ball. Anything else is valued as a 2000 special ball
+_BALL_COST = {"poke_ball": 300, "great_ball": 600, "ultra_ball": 1000}
+
+
+def _rank_candidate(candidate):
+    """Sort key for capture candidates: best score, then balls already owned, then cheapest"""
+
+    return candidate["score"], candidate["source"] == "inventory", -_BALL_COST.get(candidate["ball"], 2000)
+
+
+# Balls only worth throwing at S, A and B tiers
+_HIGH_TIER_BALLS = frozenset({
+    "ultra_ball", "quick_ball", "timer_ball",
+    "heavy_ball", "feather_ball", "net_ball", "phantom_ball",
+    "night_ball", "frozen_ball", "cipher_ball", "magnet_ball",
+    "fantasy_ball", "geo_ball", "heal_ball", "fast_ball",
+})
+_HIGH_TIERS = frozenset({"S", "A", "B"})
+
+# Balls allowed on C tier besides a cash-gated great ball
+_C_TIER_BALLS = frozenset({"poke_ball", "premier_ball"})
+
+# Balls that can be bought when missing from inventory
+_SHOP_BALLS = frozenset({"poke_ball", "great_ball", "ultra_ball"})
+
+# Balls whose score does not depend on the pokemon
+_BALL_BASE_SCORES = {
+    "poke_ball": 30,
+    "great_ball": 55,
+    "ultra_ball": 80,
+    "master_ball": 1000,
+    "premier_ball": 30,
+    "cherish_ball": 30,
+    "great_cherish_ball": 55,
+    "ultra_cherish_ball": 80,
+    "quick_ball": 90,
+    "timer_ball": 90,
+    "level_ball": 50,
+    "stone_ball": 50,
+}
+
+# Type balls: (types that trigger the bonus, bonus score). Anything else scores 30
+_TYPE_BALL_SCORES = {
+    "net_ball": (frozenset({"water", "bug"}), 70),
+    "phantom_ball": (frozenset({"ghost"}), 80),
+    "night_ball": (frozenset({"dark"}), 80),
+    "frozen_ball": (frozenset({"ice"}), 80),
+    "cipher_ball": (frozenset({"poison", "psychic"}), 70),
+    "magnet_ball": (frozenset({"electric", "steel"}), 80),
+    "fantasy_ball": (frozenset({"dragon", "fairy"}), 80),
+    "geo_ball": (frozenset({"rock", "ground"}), 80),
+}
+
+# Balls whose score depends on pokemon stats or user data
+_BALL_SCORE_HANDLERS = {
+    "heavy_ball": _score_heavy_ball,
+    "feather_ball": _score_feather_ball,
+    "heal_ball": _score_heal_ball,
+    "fast_ball": _score_fast_ball,
+    "repeat_ball": _score_repeat_ball,
+    "friend_ball": _score_friend_ball,
+    "buddy_ball": _score_friend_ball,
+    "clone_ball": _score_clone_ball,
+}
+
+
+# Mission target op -> predicate(pokemon_data, mission_value)
+_MISSION_CHECKS = {
+    "tier": lambda pokemon_data, value: pokemon_data["tier"] == value,
+    "bst_greater": lambda pokemon_data, value: pokemon_data["base_stats"] > value,
+    "bst_lower": lambda pokemon_data, value: pokemon_data["base_stats"] < value,
+    "weight_greater": lambda pokemon_data, value: pokemon_data["weight"] > value,
+    "weight_lower": lambda pokemon_data, value: pokemon_data["weight"] < value,
+    "type_count": lambda pokemon_data, value: len(pokemon_data["types"]) == value,
+    "type": lambda pokemon_data, value: value in pokemon_data["types"],
+}
+
+
+# Chat names ("ultra ball") of every ball this module knows about
+_BALL_DISPLAY_NAMES = {
+    ball: ball.replace("_", " ")
+    for ball in (*POKE_BALLS_LIST, *_BALL_BASE_SCORES, *_TYPE_BALL_SCORES, *_BALL_SCORE_HANDLERS)
+}
+
+
+def get_ball_display_name(ball):
+    """Returns the name used in chat commands for a ball"""
+
+    return _BALL_DISPLAY_NAMES.get(ball) or ball.replace("_", " ")
+
+
+def get_pokemon_id_from_chat_message(chat_message, dex_names):
+    """"Finds out which pokemon spawned from a chat message. dex_names holds (lowercase name, pokedex_id) pairs"""
 
-    names_matches = []
-    for entry in pokedex:
-        if entry["name"].lower() in chat_message.lower():
-            names_matches.append(entry["pokedex_id"])
+    message = chat_message.lower()
 
-    return names_matches[-1] if len(names_matches) > 0 else None
+    pokedex_id = None
+    for name, entry_id in dex_names:
+        if name in message:
+            pokedex_id = entry_id
+
+    return pokedex_id
 
 
 async def sleep_before_catch(spawn_date, chosen_ball):
     """"Sleeps before attempting catch. This is used to time throws and randomize bot behaviour"""
 
     if chosen_ball == "quick_ball":
-        print("Quick Ball selected: Skipping sleep to maximize catch rate.")
+        log.info("Quick Ball selected: Skipping sleep to maximize catch rate.")
         return
 
     sleep_time = 0
+    now = _now()
 
     if chosen_ball == "timer_ball":
         desired_throw_time: datetime = spawn_date + timedelta(minutes=1, seconds=20)
-        remaining_time = (desired_throw_time - datetime.now(tz=tz.tzlocal())).total_seconds()
+        remaining_time = (desired_throw_time - now).total_seconds()
 
         if floor(remaining_time) > 0:
             sleep_time = floor(remaining_time)
-            print(f"Timer Ball selected: Waiting {sleep_time}s to maximize effectiveness.")
+            log.info("Timer Ball selected: Waiting %ss to maximize effectiveness.", sleep_time)
 
     else:
         max_wait_time: datetime = spawn_date + timedelta(minutes=1)
-        remaining_time = (max_wait_time - datetime.now(tz=tz.tzlocal())).total_seconds()
+        remaining_time = (max_wait_time - now).total_seconds()
 
         if floor(remaining_time) > 0:
             sleep_time = randint(0, floor(remaining_time))
 
     if sleep_time > 0:
-        print(f"Sleeping {sleep_time} seconds before attempting catch.")
+        log.info("Sleeping %s seconds before attempting catch.", sleep_time)
         await asyncio.sleep(sleep_time)
@@ -1,9 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from json import dumps
 import asyncio
+import logging
+import time
 
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import QTimer, pyqtSignal
 
 from src.GuiPages.alert import AlertPage
 from src.GuiPages.config import ConfigPage
@@ -19,6 +21,58 @@ from src.helpers.UserData import UserData
 from assets.const.bot_status import BOT_STATUS
 from assets.const.connection_status import CONNECTION_STATUS
 
+log = logging.getLogger(__name__)
+
+# Status values bound once, so hot paths do not index the status dicts
+_CS_STARTING = CONNECTION_STATUS["STARTING"]
+_CS_LOADING = CONNECTION_STATUS["LOADING"]
+_CS_DISCONNECTED = CONNECTION_STATUS["DISCONNECTED"]
+_CS_GETTING_JWT = CONNECTION_STATUS["GETTING_JWT"]
+_CS_CONNECTING_SOCKET = CONNECTION_STATUS["CONNECTING_SOCKET"]
+_CS_CONNECTED = CONNECTION_STATUS["CONNECTED"]
+_CS_TIMEOUT = CONNECTION_STATUS["TIMEOUT"]
+_CS_SOCKET_ERROR = CONNECTION_STATUS["SOCKET_ERROR"]
+_CS_ERROR = CONNECTION_STATUS["ERROR"]
+_BS_ACTIVE = BOT_STATUS["ACTIVE"]
+_BS_STOPPED = BOT_STATUS["STOPPED"]
+
+# Connection statuses in which the main tick has nothing to do
+_CS_IDLE = frozenset({_CS_DISCONNECTED, _CS_ERROR})
+# Connection statuses from which a fresh JWT moves on to the chat connection
+_CS_AWAITING_JWT = frozenset({_CS_GETTING_JWT, _CS_LOADING})
+
+# Pokemon data fields the home page reads, per section
+_GUI_POKEMON_FIELDS = {
+    "captured": ("total_count", "unique_count", "shiny_count"),
+    "pokedex": ("total_count", "total_progress", "spawn_count", "spawn_progress"),
+    "inventory": ("cash", "items"),
+    "missions": ("end_date", "missions"),
+}
+
+# Home page fields waiting for the next coalesced flush
+_DIRTY_CONN = 1
+_DIRTY_BOT = 2
+_DIRTY_USER = 4
+
+# Longest the main loop sleeps without a deadline or a state change
+MAX_TICK_DELAY = 60.0
+# Pause after a failed main tick, so an error that repeats on every tick cannot spin the loop
+_TICK_ERROR_DELAY_S = 1.0
+
+# Seconds before JWT expiration at which a new one is requested
+_JWT_REFRESH_MARGIN_S = 600.0
+# Shortest gap between two JWT refresh attempts, even when the current token is already inside the margin
+_JWT_REFRESH_RETRY_S = 60.0
+# Seconds to wait before retrying after a login timeout or a chat socket error
+_RETRY_COOLDOWN_S = 15.0
+# Chat socket errors closer together than this are treated as one
+_SOCKET_ERROR_DEBOUNCE_S = 0.25
+
+
+def _log_task_error(task):
+    if not task.cancelled() and task.exception() is not None:
+        log.error("Background task failed: %s", task.exception())
+
 
 class MainApplication(QWidget):
     """
@@ -36,8 +90,8 @@ class MainApplication(QWidget):
 
         self._program_path = program_path
 
-        self._connection_status = CONNECTION_STATUS["STARTING"]
-        self._bot_status = BOT_STATUS["ACTIVE"]
+        self._connection_status = _CS_STARTING
+        self._bot_status = _BS_ACTIVE
 
         self.LogicConfig = LogicConfig(
             self._program_path,
@@ -72,7 +126,8 @@ class MainApplication(QWidget):
             self.LogicConfig,
             self.PokemonData,
             self.last_spawn_data_callback,
-            self.TwitchSocketManager.send_chat_message
+            self.TwitchSocketManager.send_chat_message,
+            self.spawn_state_callback
         )
 
         self.HomePage = HomePage(
@@ -98,13 +153,37 @@ class MainApplication(QWidget):
 
         self._user_data = None
         self._poke_jwt = None
+        self._jwt_refresh_at = 0.0 # time.monotonic() deadline to refresh the current JWT
 
-        self._time_out_error = None
-        self._socket_error = None
+        # time.monotonic() deadlines to retry after a login timeout or a chat socket error
+        self._timeout_retry_at = 0.0
+        self._socket_retry_at = 0.0
+        self._last_socket_error_at = float("-inf") # Debounces bursts of chat socket errors
 
         self._main_task = None
+        self._shutdown_task = None
         self._is_running = True
 
+        # Set by state changes so the main loop reacts immediately instead of waiting for its next deadline
+        self._wake = asyncio.Event()
+
+        self._clear_cookies_task = None
+
+        # Main tick work per connection status
+        self._tick_dispatch = {
+            _CS_STARTING: self._tick_starting,
+            _CS_CONNECTED: self._tick_connected,
+            _CS_TIMEOUT: self._tick_timeout,
+            _CS_SOCKET_ERROR: self._tick_socket_error,
+        }
+
+        # Home page updates are batched and flushed once per event loop turn
+        self._dirty = 0
+        self._dirty_pending = False
+
+        # Serialized pokemon data sections, reused while PokemonData keeps the same section object
+        self._pokemon_data_fragments = {}
+
         self.init_gui()
 
     def init_gui(self):
@@ -115,88 +194,137 @@ class MainApplication(QWidget):
         """Main async entry point called by main.py"""
         self._is_running = True
         self._main_task = asyncio.create_task(self._main_loop())
-        
-        while self._is_running:
-             await asyncio.sleep(1)
+
+        try:
+            # Waiting rather than awaiting the task keeps the cancellation requested by _shutdown out of run()
+            await asyncio.wait((self._main_task,))
+        except asyncio.CancelledError:
+            self._main_task.cancel()
+            raise
+
+        if not self._main_task.cancelled():
+            self._main_task.result()
+
+        # Keep the event loop alive until the browser has been closed
+        if self._shutdown_task is not None:
+            await self._shutdown_task
 
     async def _main_loop(self):
-        """Main loop that replaces Worker"""
+        """Main loop that replaces Worker. Sleeps until the next deadline or until a state change wakes it"""
         while self._is_running:
-            await self._main_tick()
-            await asyncio.sleep(1)
+            try:
+                await self._main_tick()
+            except Exception:
+                log.exception("Main tick failed")
+                await asyncio.sleep(_TICK_ERROR_DELAY_S)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._next_tick_delay())
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _next_tick_delay(self):
+        """Seconds until the main tick has something to do, if nothing wakes it earlier"""
+        delays = [MAX_TICK_DELAY]
+        connection_status = self._connection_status
+
+        if connection_status == _CS_CONNECTED:
+            delays.append(self.LogicDealer.next_routine_delay())
+
+            if self._poke_jwt is not None:
+                delays.append(self._jwt_refresh_at - time.monotonic())
+
+        elif connection_status == _CS_TIMEOUT:
+            delays.append(self._timeout_retry_at - time.monotonic())
+
+        elif connection_status == _CS_SOCKET_ERROR:
+            delays.append(self._socket_retry_at - time.monotonic())
+
+        # Small margin so we never wake up just before a deadline
+        return max(min(delays), 0) + 0.05
 
     async def _main_tick(self):
         """Single iteration of the main loop logic"""
-        if self.connection_status == CONNECTION_STATUS["DISCONNECTED"] or \
-                self.connection_status == CONNECTION_STATUS["ERROR"] or \
-                self.bot_status == BOT_STATUS["STOPPED"]:
+        connection_status = self._connection_status
+        if connection_status in _CS_IDLE or self._bot_status == _BS_STOPPED:
             return
 
-        if self.connection_status == CONNECTION_STATUS["STARTING"]:
-            self._get_twitch_oauth()
+        handler = self._tick_dispatch.get(connection_status)
+        if handler is not None:
+            handler()
 
-        elif self.connection_status == CONNECTION_STATUS["CONNECTED"]:
+    def _tick_starting(self):
+        self._get_twitch_oauth()
 
-            if self.poke_jwt is None or self.poke_jwt.exp - datetime.now() < timedelta(minutes=10):
-                self._get_twitch_jwt()
-                return
+    def _tick_connected(self):
+        now = time.monotonic()
+        if self._poke_jwt is None or now >= self._jwt_refresh_at:
+            # A refresh that hands back a token still inside the margin must not trigger another one straight away
+            self._jwt_refresh_at = now + _JWT_REFRESH_RETRY_S
+            self._get_twitch_jwt()
+            return
 
-            if not self.TwitchSocketManager.connected:
-                self._connect_chat(self.LogicConfig.channel)
-                return
+        if not self.TwitchSocketManager.connected:
+            self._connect_chat(self.LogicConfig.channel)
+            return
 
-            self.LogicDealer.spawn_routine(self.bot_status)
+        self.LogicDealer.spawn_routine(self._bot_status)
 
-        elif self.connection_status == CONNECTION_STATUS["TIMEOUT"]:
-            if datetime.now() - self._time_out_error > timedelta(seconds=15):
-                self._get_twitch_oauth()
+    def _tick_timeout(self):
+        if time.monotonic() >= self._timeout_retry_at:
+            self._get_twitch_oauth()
 
-        elif self.connection_status == CONNECTION_STATUS["SOCKET_ERROR"]:
-            if datetime.now() - self._socket_error > timedelta(seconds=15):
-                self._connect_chat(self.LogicConfig.channel)
+    def _tick_socket_error(self):
+        if time.monotonic() >= self._socket_retry_at:
+            self._connect_chat(self.LogicConfig.channel)
 
     def request_twitch_login(self):
-        print("GUI: User requested Login. Setting status to LOADING.")
-        self._get_twitch_oauth()
+        log.info("GUI: User requested Login. Setting status to LOADING.")
+        # A login asked for by the user goes through even while LOADING, e.g. to retry a stuck one
+        self._get_twitch_oauth(force=True)
+
+    def _try_transition(self, target_status, action, force=False):
+        """Moves to target_status and runs action, unless the bot is stopped or, without force, already there"""
+        if self._bot_status == _BS_STOPPED or (self._connection_status == target_status and not force):
+            return
+
+        self._set_connection_status(target_status)
+        action()
 
-    def _get_twitch_oauth(self):
-        if self.bot_status != BOT_STATUS["STOPPED"]:
-            self.connection_status = CONNECTION_STATUS["LOADING"]
-            self.TwitchLoginManager.start_get_twitch_oauth_process()
+    def _get_twitch_oauth(self, force=False):
+        self._try_transition(_CS_LOADING, self.TwitchLoginManager.start_get_twitch_oauth_process, force)
 
     def _get_twitch_jwt(self):
-        if self.bot_status != BOT_STATUS["STOPPED"] and self.connection_status != CONNECTION_STATUS["GETTING_JWT"]:
-            self.connection_status = CONNECTION_STATUS["GETTING_JWT"]
-            self.TwitchLoginManager.get_twitch_jwt()
+        self._try_transition(_CS_GETTING_JWT, self.TwitchLoginManager.get_twitch_jwt)
 
     def _connect_chat(self, channel):
-        if self.user_data is not None and self.bot_status != BOT_STATUS["STOPPED"]:
-            self.connection_status = CONNECTION_STATUS["CONNECTING_SOCKET"]
-            self.TwitchSocketManager.connect(self.user_data, channel)
+        if self._user_data is not None:
+            self._try_transition(_CS_CONNECTING_SOCKET, lambda: self.TwitchSocketManager.connect(self._user_data, channel))
 
     def _get_pokemon_user_data(self):
-        if self.bot_status != BOT_STATUS["STOPPED"]:
+        if self._bot_status != _BS_STOPPED:
             self.PokemonData.update_data()
 
 
     def change_bot_status(self, new_status):
-        if new_status == BOT_STATUS["STOPPED"]:
+        if new_status == _BS_STOPPED:
             self.TwitchSocketManager.disconnect()
 
-        if self.bot_status == BOT_STATUS["STOPPED"] and new_status != BOT_STATUS["STOPPED"]:
-            self.connection_status = CONNECTION_STATUS["STARTING"]
+        if self._bot_status == _BS_STOPPED and new_status != _BS_STOPPED:
+            self._set_connection_status(_CS_STARTING)
 
-        self.bot_status = new_status
+        self._set_bot_status(new_status)
 
     def open_config(self):
         self.ConfigPage.open()
 
     def twitch_logout(self):
-        self.connection_status = CONNECTION_STATUS["DISCONNECTED"]
+        self._set_connection_status(_CS_DISCONNECTED)
         
-        asyncio.create_task(self.TwitchLoginManager.clear_cookies())
-        self.user_data = None
-        self.poke_jwt = None
+        self._clear_cookies()
+        self._set_user_data(None)
+        self._set_poke_jwt(None)
 
         self.TwitchSocketManager.disconnect()
 
@@ -211,180 +339,227 @@ class MainApplication(QWidget):
         self.HomePage.update_theme(new_theme)
 
     def update_channel_callback(self, new_channel):
-        if self.connection_status == CONNECTION_STATUS["CONNECTED"]:
-            self.connection_status = CONNECTION_STATUS["CONNECTING_SOCKET"]
+        if self._connection_status == _CS_CONNECTED:
             self.TwitchSocketManager.disconnect()
             self._connect_chat(new_channel)
 
         self.HomePage.update_joined_chat(new_channel)
 
+    def _clear_cookies(self):
+        """Starts clearing the Twitch cookies, replacing any clear still in progress"""
+        if self._clear_cookies_task is not None and not self._clear_cookies_task.done():
+            self._clear_cookies_task.cancel()
+
+        self._clear_cookies_task = asyncio.create_task(self.TwitchLoginManager.clear_cookies())
+        self._clear_cookies_task.add_done_callback(_log_task_error)
+
     def twitch_connection_status_callback(self, connection_data):
         if not connection_data["username"]:
-            print("Login Error: Missing username.")
-            self.connection_status = CONNECTION_STATUS["DISCONNECTED"]
-            self.user_data = None
-            asyncio.create_task(self.TwitchLoginManager.clear_cookies())
+            log.warning("Login Error: Missing username.")
+            self._set_connection_status(_CS_DISCONNECTED)
+            self._set_user_data(None)
+            self._clear_cookies()
             self.TwitchSocketManager.disconnect()
         else:
-            self.user_data = UserData(connection_data)
+            # Repeated callbacks with the same credentials keep the current UserData
+            if self._user_data is None or self._user_data.raw != connection_data:
+                self._set_user_data(UserData(connection_data))
             self._get_twitch_jwt()
 
     def twitch_update_jwt_callback(self, encoded_jwt):
-        if self.connection_status == CONNECTION_STATUS["ERROR"]:
+        # A JWT arriving after an error or a logout belongs to a discarded session
+        if self._connection_status in _CS_IDLE:
             return
 
         if not encoded_jwt:
-            self.poke_jwt = None
+            self._set_poke_jwt(None)
             return
         else:
-            self.poke_jwt = PokeJwt(encoded_jwt)
+            # Only decode tokens we have not seen yet
+            if self._poke_jwt is None or self._poke_jwt.jwt != encoded_jwt:
+                self._set_poke_jwt(PokeJwt(encoded_jwt))
+            else:
+                # The refresh still completed, so requests waiting on it must be released
+                self.PokemonData.update_poke_jwt(self._poke_jwt)
             self._get_pokemon_user_data()
 
-            if self.connection_status in [CONNECTION_STATUS["GETTING_JWT"], CONNECTION_STATUS["LOADING"], CONNECTION_STATUS["DISCONNECTED"]]:
+            if self._connection_status in _CS_AWAITING_JWT:
                 if not self.TwitchSocketManager.connected:
                     self._connect_chat(self.LogicConfig.channel)
                 else:
-                    self.connection_status = CONNECTION_STATUS["CONNECTED"]
+                    self._set_connection_status(_CS_CONNECTED)
 
     def twitch_login_success_callback(self):
-        self.connection_status = CONNECTION_STATUS["LOADING"]
+        self._set_connection_status(_CS_LOADING)
 
     def twitch_connection_timeout_callback(self):
-        if self.connection_status == CONNECTION_STATUS["LOADING"]:
-            self.user_data = None
-            self.poke_jwt = None
-        elif self.connection_status == CONNECTION_STATUS["GETTING_JWT"]:
-            self.poke_jwt = None
+        if self._connection_status == _CS_LOADING:
+            self._set_user_data(None)
+            self._set_poke_jwt(None)
+        elif self._connection_status == _CS_GETTING_JWT:
+            self._set_poke_jwt(None)
 
-        self._time_out_error = datetime.now()
-        self.connection_status = CONNECTION_STATUS["TIMEOUT"]
+        self._timeout_retry_at = time.monotonic() + _RETRY_COOLDOWN_S
+        self._set_connection_status(_CS_TIMEOUT)
 
     def twitch_error_callback(self):
-        self.user_data = None
-        self.poke_jwt = None
-        asyncio.create_task(self.TwitchLoginManager.clear_cookies())
+        self._set_user_data(None)
+        self._set_poke_jwt(None)
+        self._clear_cookies()
         
-        self.bot_status = BOT_STATUS["STOPPED"]
-        self.connection_status = CONNECTION_STATUS["ERROR"]
+        self._set_bot_status(_BS_STOPPED)
+        self._set_connection_status(_CS_ERROR)
 
     def chat_connection_callback(self):
-        if self.connection_status == CONNECTION_STATUS["CONNECTING_SOCKET"]:
-            self.connection_status = CONNECTION_STATUS["CONNECTED"]
+        if self._connection_status == _CS_CONNECTING_SOCKET:
+            self._set_connection_status(_CS_CONNECTED)
 
     def chat_disconnection_callback(self):
-        if self.connection_status != CONNECTION_STATUS["DISCONNECTED"] and self.bot_status != BOT_STATUS["STOPPED"]:
-            self._socket_error = datetime.now()
-            self.connection_status = CONNECTION_STATUS["SOCKET_ERROR"]
+        if self._connection_status != _CS_DISCONNECTED and self._bot_status != _BS_STOPPED:
+            self._on_socket_error()
 
     def chat_connection_error_callback(self):
-        self._socket_error = datetime.now()
-        self.connection_status = CONNECTION_STATUS["SOCKET_ERROR"]
+        self._on_socket_error()
+
+    def _on_socket_error(self):
+        """Schedules a chat reconnection, ignoring repeats from the same network flap"""
+        now = time.monotonic()
+        if now - self._last_socket_error_at < _SOCKET_ERROR_DEBOUNCE_S:
+            return
+
+        self._last_socket_error_at = now
+        self._socket_retry_at = now + _RETRY_COOLDOWN_S
+        self._set_connection_status(_CS_SOCKET_ERROR)
 
     def poke_spawn_callback(self, chat_message):
-        if self.bot_status != BOT_STATUS["STOPPED"]:
-            self.LogicDealer.investigate_last_spawn(self.bot_status, chat_message)
+        if self._bot_status != _BS_STOPPED:
+            self.LogicDealer.investigate_last_spawn(self._bot_status, chat_message)
 
     def poke_data_update_callback(self):
         self.pokemon_data_updated_signal.emit()
 
     def _on_pokemon_data_updated_slot(self):
-        print("Pokemon data updated (Main Thread).")
+        log.debug("Pokemon data updated (Main Thread).")
         
-        self.HomePage.update_pokemon_data(dumps({
-            "captured": self.PokemonData.captured,
-            "pokedex": self.PokemonData.pokedex,
-            "inventory": self.PokemonData.inventory,
-            "missions": self.PokemonData.missions,
-        }))
+        fragments = []
+        for key in _GUI_POKEMON_FIELDS:
+            section = getattr(self.PokemonData, key)
+            cached = self._pokemon_data_fragments.get(key)
+            if cached is None or cached[0] is not section:
+                cached = (section, dumps({field: section.get(field) for field in _GUI_POKEMON_FIELDS[key]}))
+                self._pokemon_data_fragments[key] = cached
+            fragments.append(f'"{key}": {cached[1]}')
+
+        self.HomePage.update_pokemon_data("{" + ", ".join(fragments) + "}")
 
     def poke_data_error_callback(self, error_code=None):
-        print(f"Error fetching Pokemon Data (Code: {error_code}).")
+        log.warning("Error fetching Pokemon Data (Code: %s).", error_code)
         
         if error_code == -24 or error_code == 401:
-             print("Token Expired or Invalid. Triggering Refresh...")
-             if self.connection_status != CONNECTION_STATUS["GETTING_JWT"]:
+             log.info("Token Expired or Invalid. Triggering Refresh...")
+             if self._connection_status != _CS_GETTING_JWT:
                  self._get_twitch_jwt()
              else:
-                 print("Already refreshing JWT. Ignoring error.")
+                 log.debug("Already refreshing JWT. Ignoring error.")
 
     def last_spawn_data_callback(self, spawn_data):
         self.HomePage.update_last_spawn(dumps(spawn_data))
 
+    def spawn_state_callback(self):
+        # The post-spawn data update may now be due sooner than the loop's current sleep
+        self._wake.set()
+
     def on_home_load_callback(self):
-        self.HomePage.update_connection_status(self.connection_status)
-        self.HomePage.update_bot_status(self.bot_status)
+        self.HomePage.update_connection_status(self._connection_status)
+        self.HomePage.update_bot_status(self._bot_status)
         self.HomePage.update_language(self.LogicConfig.language)
         self.HomePage.update_theme(self.LogicConfig.theme)
         self.HomePage.update_joined_chat(self.LogicConfig.channel)
-        if self.user_data is not None:
-            self.HomePage.update_username(self.user_data.username)
+        if self._user_data is not None:
+            self.HomePage.update_username(self._user_data.username)
 
     def on_home_close_callback(self):
         self._is_running = False
-        if self._main_task:
-             self._main_task.cancel()
+        self._wake.set()
 
         self.HomePage.close()
         self.ConfigPage.close()
         self.AlertPage.close()
-        self.TwitchLoginManager.close_web()
+
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.create_task(self._shutdown())
+
+    async def _shutdown(self):
+        """Stops the main loop before releasing the chat socket and the browser"""
+        if self._main_task is not None:
+            self._main_task.cancel()
+            try:
+                await self._main_task
+            except asyncio.CancelledError:
+                pass
+
         self.TwitchSocketManager.disconnect()
+        await self.PokemonData.close()
+        await self.TwitchLoginManager.close_web_async()
 
     def on_alert_load_callback(self):
         self.AlertPage.update_language(self.LogicConfig.language)
 
     def on_config_load_callback(self):
-        self.ConfigPage.update_config_data(dumps({
-            "language": self.LogicConfig.language,
-            "theme": self.LogicConfig.theme,
-            "channel": self.LogicConfig.channel,
-            "shop": self.LogicConfig.shop,
-            "catch": self.LogicConfig.catch,
-            "stats_balls": self.LogicConfig.stats_balls,
-        }))
+        self.ConfigPage.update_config_data(self.LogicConfig.config_json)
 
     def save_config_callback(self, new_config):
         self.LogicConfig.update(new_config)
         self.on_config_load_callback()
 
-    @property
-    def connection_status(self):
-        return self._connection_status
-
-    @connection_status.setter
-    def connection_status(self, new_value):
+    def _mark_dirty(self, flag):
+        self._dirty |= flag
+        if self._dirty_pending:
+            return
+        self._dirty_pending = True
+        QTimer.singleShot(0, self._flush_gui)
+
+    def _flush_gui(self):
+        """Pushes the latest value of every field changed since the last flush to the home page"""
+        dirty = self._dirty
+        self._dirty = 0
+        self._dirty_pending = False
+
+        if dirty & _DIRTY_CONN:
+            self.HomePage.update_connection_status(self._connection_status)
+        if dirty & _DIRTY_BOT:
+            self.HomePage.update_bot_status(self._bot_status)
+        if dirty & _DIRTY_USER and self._user_data is not None:
+            self.HomePage.update_username(self._user_data.username)
+
+    def _set_connection_status(self, new_value):
         if self._connection_status != new_value:
             self._connection_status = new_value
-            self.HomePage.update_connection_status(new_value)
+            self._mark_dirty(_DIRTY_CONN)
+            self._wake.set()
 
-    @property
-    def bot_status(self):
-        return self._bot_status
-
-    @bot_status.setter
-    def bot_status(self, new_value):
+    def _set_bot_status(self, new_value):
         if self._bot_status != new_value:
             self._bot_status = new_value
-            self.HomePage.update_bot_status(new_value)
-
-    @property
-    def user_data(self):
-        return self._user_data
-
-    @user_data.setter
-    def user_data(self, new_value):
-        if self._user_data != new_value:
+            self._mark_dirty(_DIRTY_BOT)
+            self._wake.set()
+
+    def _set_user_data(self, new_value):
+        # Credentials decide whether the user changed, not the UserData instance
+        old_key = self._user_data.key if self._user_data is not None else None
+        new_key = new_value.key if new_value is not None else None
+        if old_key != new_key:
             self._user_data = new_value
 
             if new_value is not None:
-                self.HomePage.update_username(new_value.username)
+                self._mark_dirty(_DIRTY_USER)
 
-    @property
-    def poke_jwt(self):
-        return self._poke_jwt
-
-    @poke_jwt.setter
-    def poke_jwt(self, new_value):
+    def _set_poke_jwt(self, new_value):
         if self._poke_jwt != new_value:
             self._poke_jwt = new_value
+            if new_value is not None:
+                refresh_in = (new_value.exp - datetime.now()).total_seconds() - _JWT_REFRESH_MARGIN_S
+                # A token that is already due waits out the retry gap, otherwise it would be refreshed in a loop
+                self._jwt_refresh_at = time.monotonic() + (refresh_in if refresh_in > 0 else _JWT_REFRESH_RETRY_S)
             self.PokemonData.update_poke_jwt(new_value)
+            self._wake.set()
@@ -1,14 +1,45 @@
 import re
 import asyncio
+import logging
 from datetime import datetime
-import json
+from json import loads
 from dateutil import parser, tz
 from src.helpers.SignatureHelper import SignatureHelper
 import httpx # For the fallback/external GET requests
-import sys
 
 from assets.const.urls import POKEMON_EXTENSION_URL, POKEMON_SPAWN_URL
 
+log = logging.getLogger(__name__)
+
+_LOCAL_TZ = tz.tzlocal()
+
+# Upper bound on memoized species details, comfortably above the size of the pokedex
+_POKEMON_DETAILS_CACHE_SIZE = 2048
+
+# Full URLs of the endpoints fetched on every data update
+_DATA_URLS = {
+    data_type: f"{POKEMON_EXTENSION_URL}/{data_type}"
+    for data_type in ("pokemon/v2/", "inventory/v3/", "mission/v2/", "pokedex/v2/")
+}
+
+_spawn_client = None # httpx.AsyncClient, created on first use
+
+# Mission name patterns, matched against the lowercased name
+_MISSION_TIER_RE = re.compile(r"tier\s+(\w)")
+_MISSION_NUMBER_RE = re.compile(r"\d+")
+_MISSION_KG_RE = re.compile(r"(\d+)\s*kg")
+
+# "error" field of an API error body that is not valid JSON
+_API_ERROR_RE = re.compile(r'"error"\s*:\s*(-?\d+)')
+
+# Types a catch mission can target, in matching priority order
+_MISSION_POKEMON_TYPES = (
+    "normal", "fighting", "rock", "fire", "poison", "ghost", "water", "ground", "dragon",
+    "grass", "flying", "dark", "electric", "psychic", "ice", "bug", "fairy"
+)
+# Zero-width lookahead, so overlapping type names inside one word are all found
+_MISSION_TYPE_RE = re.compile("(?=(" + "|".join(_MISSION_POKEMON_TYPES) + "))")
+
 class PokemonData:
     """
     This class handles fetching user pokemon data asynchronously.
@@ -19,11 +50,15 @@ class PokemonData:
         self._browser_service = browser_service
         self._jwt_refreshed = asyncio.Event()
         self._jwt_refreshed.set() # Unblocked initially
+        self._jwt_refresh_pending = False # A -24 refresh was requested and its wait has not ended yet
+        self._dex_ready = asyncio.Event() # Set once the pokedex has entries
 
         self._data_update_callback = poke_data_update_callback
         self._data_error_callback = poke_data_error_callback
 
         self._update_task = None
+        self._update_pending = False # Set when an update is requested while one is running
+        self._inflight_fetches = dict() # data_type -> task of the request currently running for it
         
         # Register Passive Listener (now an async callback internally)
         self._browser_service.add_response_listener("poketwitch.bframework.de", self._on_browser_response)
@@ -34,11 +69,13 @@ class PokemonData:
             "unique_count": 0,
             "shiny_count": 0,
             "buddy_types": [],
+            "pokemon_by_id": dict(),
         }
 
         self._inventory = {
             "cash": 0,
             "items": [],
+            "sprite_names": frozenset(),
         }
 
         self._missions = {
@@ -48,17 +85,21 @@ class PokemonData:
         }
 
         self._pokedex = {
-            "dex": [],
+            "dex_names": (),
             "total_count": 0,
             "total_progress": 0,
             "spawn_count": 0,
             "spawn_progress": 0,
         }
-        
-        self._buddy_details_cache = {
-             "pokedex_id": None,
-             "data": None
-        }
+
+        # (lowercase name, pokedex_id) pairs, rebuilt with the pokedex for chat message matching
+        self._dex_names = ()
+
+        # Species details per pokedex id. They never change, so entries are kept for the whole session
+        self._pokemon_details_cache = dict()
+
+        # Last passive payload applied per route, so repeated identical sniffs are not handled again
+        self._passive_payloads = dict()
 
     def update_poke_jwt(self, new_value):
         """Updates JWT"""
@@ -68,41 +109,82 @@ class PokemonData:
 
     def update_data(self):
         """Spawns an async task to fetch user's pokemon data"""
-        if self._poke_jwt is not None:
-             self._update_task = asyncio.create_task(self._update_data_async())
+        if self._poke_jwt is None:
+            return
 
-    async def _update_data_async(self):
-        print("Updating pokemon data (Async Fetch)...")
+        # Requests made during a running update fold into a single follow-up pass
+        if self._update_task is not None and not self._update_task.done():
+            self._update_pending = True
+            return
 
-        captured_raw = await self._fetch_api_data("pokemon/v2/")
-        captured = await handle_captured_data(captured_raw, self.get_pokemon_data, self._buddy_details_cache)
+        self._update_task = asyncio.create_task(self._run_updates())
+
+    async def _run_updates(self):
+        self._update_pending = True
+        while self._update_pending:
+            self._update_pending = False
+            await self._update_data_async()
+
+    async def _update_data_async(self):
+        log.debug("Updating pokemon data (Async Fetch)...")
+
+        # The endpoints are independent, so their round trips overlap instead of adding up
+        # A failing endpoint only loses its own section, the others are still applied
+        results = await asyncio.gather(
+            self._fetch_api_data("pokemon/v2/"),
+            self._fetch_api_data("inventory/v3/"),
+            self._fetch_api_data("mission/v2/"),
+            self._fetch_api_data("pokedex/v2/"),
+            return_exceptions=True,
+        )
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                log.error("Pokemon data fetch failed: %s", result)
+                results[index] = None
+        captured_raw, inventory_raw, missions_raw, pokedex_raw = results
+
+        captured = await handle_captured_data(captured_raw, self.get_pokemon_data)
         self._captured = captured if captured is not None else self._captured
 
-        inventory_raw = await self._fetch_api_data("inventory/v3/")
         inventory = handle_inventory_data(inventory_raw)
         self._inventory = inventory if inventory is not None else self._inventory
 
-        missions_raw = await self._fetch_api_data("mission/v2/")
         missions = handle_missions_data(missions_raw)
         self._missions = missions if missions is not None else self._missions
 
-        pokedex_raw = await self._fetch_api_data("pokedex/v2/")
-        pokedex = handle_pokedex_data(pokedex_raw)
-        self._pokedex = pokedex if pokedex is not None else self._pokedex
+        self._update_pokedex(handle_pokedex_data(pokedex_raw))
+
+        # Sections now come from this fetch, the next sniff of any route is applied again
+        self._passive_payloads.clear()
 
         self._data_update_callback()
 
-    async def _fetch_api_data(self, data_type, custom_headers=None, retry_count=0):
-        """Fetches data using async browser fetch."""
+    async def _fetch_api_data(self, data_type, custom_headers=None):
+        """Fetches data using async browser fetch. Concurrent plain requests for the same endpoint share one fetch"""
+        if custom_headers:
+            return await self._request_api_data(data_type, custom_headers)
+
+        task = self._inflight_fetches.get(data_type)
+        if task is None:
+            task = asyncio.ensure_future(self._request_api_data(data_type))
+            self._inflight_fetches[data_type] = task
+            task.add_done_callback(lambda _task: self._inflight_fetches.pop(data_type, None))
+
+        # Shielded, so one caller being cancelled does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _request_api_data(self, data_type, custom_headers=None, retry_count=0):
         if self._poke_jwt is None:
             return None
 
         auth_val = self._poke_jwt.jwt
-        
-        if not data_type.endswith("/") and "?" not in data_type:
-            data_type += "/"
 
-        url = f"{POKEMON_EXTENSION_URL}/{data_type}"
+        url = _DATA_URLS.get(data_type)
+        if url is None:
+            if not data_type.endswith("/") and "?" not in data_type:
+                data_type += "/"
+
+            url = f"{POKEMON_EXTENSION_URL}/{data_type}"
 
         if custom_headers:
             headers = custom_headers
@@ -111,7 +193,7 @@ class PokemonData:
                  user_id = self._poke_jwt.user_id
                  headers = SignatureHelper.get_pcg_headers(str(user_id), url, auth_val)
             except Exception as e:
-                 print(f"Error generating signature for {url}: {e}")
+                 log.warning("Error generating signature for %s: %s", url, e)
                  headers = {
                     "Authorization": auth_val,
                     "Accept": "application/json, text/plain, */*",
@@ -123,108 +205,154 @@ class PokemonData:
             
             if response and response["status"] == 200:
                 try:
-                    return json.loads(response["text"])
-                except:
-                    print(f"Error parsing JSON from {url}")
+                    return loads(response["text"])
+                except ValueError:
+                    log.error("Error parsing JSON from %s", url)
                     return None
             else:
                 code = response["status"] if response else "Unknown"
                 text = response["text"] if response else ""
+                api_error = get_api_error_code(text) if code == 400 else None
                 
-                if code == 400 and '"error":-20' in text.replace(" ", ""):
-                    print(f"Verified: Signature required for {data_type}.")
+                if api_error == -20:
+                    log.warning("Verified: Signature required for %s.", data_type)
                     return None
 
-                if code == 400 and '"error":-24' in text.replace(" ", ""):
-                     print("Pokemon API: Token Expired. Triggering Refresh...")
+                if api_error == -24:
+                     log.info("Pokemon API: Token Expired. Triggering Refresh...")
                      
                      if retry_count == 0:
-                         self._jwt_refreshed.clear()
-                         self._data_error_callback(-24)
+                         # Concurrent expirations share the first one's refresh instead of requesting their own
+                         requested_refresh = not self._jwt_refresh_pending
+                         if requested_refresh:
+                             self._jwt_refresh_pending = True
+                             self._jwt_refreshed.clear()
+                             self._data_error_callback(-24)
                          
-                         print("Waiting for JWT Refresh (Max 60s)...")
+                         log.debug("Waiting for JWT Refresh (Max 60s)...")
                          try:
                              await asyncio.wait_for(self._jwt_refreshed.wait(), timeout=60.0)
-                             print("JWT Refreshed! Retrying request...")
-                             return await self._fetch_api_data(data_type, custom_headers=None, retry_count=1)
+                             log.debug("JWT Refreshed! Retrying request...")
+                             return await self._request_api_data(data_type, custom_headers=None, retry_count=1)
                          except asyncio.TimeoutError:
-                             print("Wait for JWT Refresh timed out.")
+                             log.warning("Wait for JWT Refresh timed out.")
                              return None
+                         finally:
+                             if requested_refresh:
+                                 self._jwt_refresh_pending = False
                      else:
-                         print("Retry failed for Token Expiration. Giving up.")
+                         log.warning("Retry failed for Token Expiration. Giving up.")
                          return None
                     
-                print(f"Pokemon request error for {data_type}. Status: {code}")
+                log.error("Pokemon request error for %s. Status: %s", data_type, code)
                 return None
                 
         except Exception as e:
             if "Event loop" not in str(e) and "stopped" not in str(e):
-                print(f"Pokemon API Request Error: {e}", file=sys.stderr, flush=True)
+                log.error("Pokemon API Request Error: %s", e)
             self._data_error_callback(None)
             return None
 
     async def _on_browser_response(self, url, json_data):
         """Callback for passive data sniffing from browser."""
-        if "pokemon/v2" in url:
-            print("Captured Passive: Pokemon List")
-            captured = await handle_captured_data(json_data, self.get_pokemon_data, self._buddy_details_cache)
-            self._captured = captured if captured is not None else self._captured
-            self._data_update_callback()
-            
-        elif "inventory/v3" in url:
-             print("Captured Passive: Inventory")
-             inventory = handle_inventory_data(json_data)
-             self._inventory = inventory if inventory is not None else self._inventory
-             self._data_update_callback()
-             
-        elif "mission/v2" in url:
-             print("Captured Passive: Missions")
-             missions = handle_missions_data(json_data)
-             self._missions = missions if missions is not None else self._missions
-             self._data_update_callback()
-             
-        elif "pokedex/v2" in url:
-             print("Captured Passive: Pokedex")
-             pokedex = handle_pokedex_data(json_data)
-             self._pokedex = pokedex if pokedex is not None else self._pokedex
-             self._data_update_callback()
+        for url_fragment, handler in _PASSIVE_HANDLERS:
+            if url_fragment in url:
+                # Twitch re-polls these endpoints, an unchanged payload would leave every section as it is
+                if self._passive_payloads.get(url_fragment) == json_data:
+                    return
+
+                await handler(self, json_data)
+                self._passive_payloads[url_fragment] = json_data
+                self._data_update_callback()
+                return
+
+    async def _on_passive_captured(self, json_data):
+        log.debug("Captured Passive: Pokemon List")
+        captured = await handle_captured_data(json_data, self.get_pokemon_data)
+        self._captured = captured if captured is not None else self._captured
+
+    async def _on_passive_inventory(self, json_data):
+        log.debug("Captured Passive: Inventory")
+        inventory = handle_inventory_data(json_data)
+        self._inventory = inventory if inventory is not None else self._inventory
+
+    async def _on_passive_missions(self, json_data):
+        log.debug("Captured Passive: Missions")
+        missions = handle_missions_data(json_data)
+        self._missions = missions if missions is not None else self._missions
+
+    async def _on_passive_pokedex(self, json_data):
+        log.debug("Captured Passive: Pokedex")
+        self._update_pokedex(handle_pokedex_data(json_data))
+
+    def _update_pokedex(self, pokedex):
+        """Stores a new pokedex and publishes its lowercase names"""
+        if pokedex is None:
+            return
+
+        self._pokedex = pokedex
+        self._dex_names = pokedex["dex_names"]
+
+        if self._dex_names:
+            self._dex_ready.set()
+
+    async def wait_for_pokedex(self, timeout):
+        """Waits until the pokedex has been loaded, giving up after timeout seconds"""
+        try:
+            await asyncio.wait_for(self._dex_ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
     async def get_pokemon_data(self, pokedex_id):
-        """Fetches specific pokemon data (Async)"""
+        """Fetches specific pokemon data (Async), cached per pokedex id"""
+        details = self._pokemon_details_cache.get(pokedex_id)
+        if details is None:
+            details = await self._get_pokemon_details(pokedex_id)
+            if details is None:
+                return None
+            if len(self._pokemon_details_cache) >= _POKEMON_DETAILS_CACHE_SIZE:
+                # Drop the oldest entry, dicts keep insertion order
+                del self._pokemon_details_cache[next(iter(self._pokemon_details_cache))]
+            self._pokemon_details_cache[pokedex_id] = details
+
+        # Callers get their own copy, spawn handling rewrites its tier
+        return dict(details)
+
+    async def _get_pokemon_details(self, pokedex_id):
         # 1. Local Cache
-        if self._captured and "all_pokemon_raw" in self._captured:
-            for p in self._captured["all_pokemon_raw"]:
-                if p["pokedexId"] == pokedex_id:
-                    if "tier" in p:
-                        def get_pokemon_types(type1, type2):
-                            types = [type1, type2]
-                            return list(filter(lambda x: x != "none" and x is not None, types))
-                        return {
-                            "pokedex_id": p["pokedexId"],
-                            "name": p["name"],
-                            "weight": p.get("weight", 0), 
-                            "types": get_pokemon_types(p.get("type1"), p.get("type2")), 
-                            "tier": p["tier"], 
-                            "base_stats": p.get("baseStats", 0),
-                            "base_hp": p.get("hp", 0),
-                            "base_speed": p.get("speed", 0),
-                        }
-                    else:
-                        break 
-                    
+        p = self._captured.get("pokemon_by_id", {}).get(pokedex_id)
+        if p is not None and "tier" in p:
+            return {
+                "pokedex_id": p["pokedexId"],
+                "name": p["name"],
+                "weight": p.get("weight", 0), 
+                "types": get_pokemon_types(p.get("type1"), p.get("type2")), 
+                "tier": p["tier"], 
+                "base_stats": p.get("baseStats", 0),
+                "base_hp": p.get("hp", 0),
+                "base_speed": p.get("speed", 0),
+            }
+
         # 2. Fetch
         try:
              url_endpoint = f"pokedex/info/v2/?pokedex_id={pokedex_id}"
              data = await self._fetch_api_data(url_endpoint)
              if data: return handle_pokemon_data(data)
         except Exception as e:
-             print(f"Error fetching signed data: {e}")
+             log.error("Error fetching signed data: %s", e)
              
-        print(f"Critical Error: Could not fetch details for ID {pokedex_id}.")
+        log.error("Critical Error: Could not fetch details for ID %s.", pokedex_id)
         return None
 
+    async def close(self):
+        """Closes the shared spawn API client"""
+        global _spawn_client
+        if _spawn_client is not None:
+            await _spawn_client.aclose()
+            _spawn_client = None
+
     def check_inventory(self, item_name):
-        return any(item.get("sprite_name") == item_name for item in self.inventory["items"])
+        return item_name in self._inventory["sprite_names"]
 
     @property
     def captured(self): return self._captured
@@ -234,69 +362,121 @@ class PokemonData:
     def missions(self): return self._missions
     @property
     def pokedex(self): return self._pokedex
+    @property
+    def dex_names(self): return self._dex_names
+
+
+def _get_spawn_client():
+    """Returns the shared spawn API client, so polls reuse its pooled connection"""
+    global _spawn_client
+    if _spawn_client is None or _spawn_client.is_closed:
+        _spawn_client = httpx.AsyncClient(timeout=10.0, limits=httpx.Limits(max_connections=4, max_keepalive_connections=2))
+    return _spawn_client
 
 
 async def get_last_spawn_data_static():
     """Fetches last spawn data from API server via Async Httpx"""
     try:
-        async with httpx.AsyncClient() as client:
-             response = await client.get(POKEMON_SPAWN_URL, timeout=10.0)
-             if response.status_code == 200:
-                 return handle_last_spawn_data(response.json())
-             else:
-                 print(f"Spawn data request error. Status: {response.status_code}")
-                 return None
+        response = await _get_spawn_client().get(POKEMON_SPAWN_URL)
+        if response.status_code == 200:
+            return handle_last_spawn_data(response.json())
+        else:
+            log.error("Spawn data request error. Status: %s", response.status_code)
+            return None
     except Exception as e:
-        print(f"Spawn data error: {e}")
+        log.error("Spawn data error: %s", e)
         return None
 
 PokemonData.get_last_spawn_data = staticmethod(get_last_spawn_data_static)
 
+# Passively sniffed endpoints and their handlers, checked in order
+_PASSIVE_HANDLERS = (
+    ("pokemon/v2", PokemonData._on_passive_captured),
+    ("inventory/v3", PokemonData._on_passive_inventory),
+    ("mission/v2", PokemonData._on_passive_missions),
+    ("pokedex/v2", PokemonData._on_passive_pokedex),
+)
+
 # Helpers
-async def handle_captured_data(server_data, get_pokemon_data, buddy_cache=None):
+def get_pokemon_types(type1, type2):
+    """Returns the pokemon types, leaving out missing second types"""
+    return [t for t in (type1, type2) if t is not None and t != "none"]
+
+
+def get_api_error_code(text):
+    """Returns the numeric "error" field of an API error body, or None"""
+    try:
+        body = loads(text)
+    except ValueError:
+        body = None
+
+    if isinstance(body, dict):
+        return body.get("error")
+
+    # Not a JSON object, fall back to looking for the field in the raw text
+    match = _API_ERROR_RE.search(text)
+    return int(match.group(1)) if match else None
+
+
+async def handle_captured_data(server_data, get_pokemon_data):
     if server_data is None: return None
 
+    all_pokemon = server_data["allPokemon"]
     data = {
-        "total_count": len(server_data["allPokemon"]),
+        "total_count": len(all_pokemon),
         "unique_captured_ids": [],
         "unique_count": 0,
         "shiny_count": 0,
         "buddy_types": [],
-        "all_pokemon_raw": server_data["allPokemon"]
+        "all_pokemon_raw": all_pokemon,
+        "pokemon_by_id": dict(),
     }
 
-    for pokemon in server_data["allPokemon"]:
-        if pokemon["pokedexId"] not in data["unique_captured_ids"]:
-            data["unique_captured_ids"].append(pokemon["pokedexId"])
-            data["unique_count"] += 1
+    # First captured entry per pokedex id, insertion ordered so ids keep their first-seen order
+    pokemon_by_id = data["pokemon_by_id"]
+    buddy_ids = [] # Buddy pokedex ids in roster order, repeats included
+    shiny_count = 0
+
+    for pokemon in all_pokemon:
+        pokedex_id = pokemon["pokedexId"]
+        pokemon_by_id.setdefault(pokedex_id, pokemon)
         if pokemon["isShiny"]:
-            data["shiny_count"] += 1
+            shiny_count += 1
 
         if pokemon.get("isBuddy", False):
-            buddy_data = None
-            if buddy_cache and buddy_cache.get("pokedex_id") == pokemon["pokedexId"] and buddy_cache.get("data"):
-                 buddy_data = buddy_cache["data"]
-            else:
-                 # Fetch logic is now async
-                 buddy_data = await get_pokemon_data(pokemon["pokedexId"])
-                 if buddy_cache is not None and buddy_data is not None:
-                     buddy_cache["pokedex_id"] = pokemon["pokedexId"]
-                     buddy_cache["data"] = buddy_data
-
+            buddy_ids.append(pokedex_id)
+
+    if buddy_ids:
+        # Details for every distinct buddy are fetched together, the last buddy with details wins as before
+        distinct_ids = list(dict.fromkeys(buddy_ids))
+        buddy_details = dict(zip(distinct_ids, await asyncio.gather(*(get_pokemon_data(i) for i in distinct_ids))))
+        for pokedex_id in reversed(buddy_ids):
+            buddy_data = buddy_details[pokedex_id]
             if buddy_data is not None:
                 data["buddy_types"] = buddy_data["types"]
+                break
+
+    data["unique_captured_ids"] = list(pokemon_by_id)
+    data["unique_count"] = len(pokemon_by_id)
+    data["shiny_count"] = shiny_count
 
     return data
 
 
 def handle_inventory_data(server_data):
     if server_data is None: return None
+    items = []
+    sprite_names = set()
+    for item in server_data["allItems"]:
+        name = item["name"]
+        sprite_name = item.get("sprite_name", name)
+        items.append({"name": name, "amount": item["amount"], "sprite_name": sprite_name})
+        sprite_names.add(sprite_name)
+
     return {
         "cash": server_data["cash"],
-        "items": [
-            {"name": item["name"], "amount": item["amount"], "sprite_name": item.get("sprite_name", item.get("name", "Unknown"))}
-            for item in server_data["allItems"]
-        ]
+        "items": items,
+        "sprite_names": frozenset(sprite_names),
     }
 
 
@@ -311,47 +491,53 @@ def handle_missions_data(server_data):
         "target_missions": [],
     }
 
-    pokemon_types = [
-        "normal", "fighting", "rock", "fire", "poison", "ghost", "water", "ground", "dragon",
-        "grass", "flying", "dark", "electric", "psychic", "ice", "bug", "fairy"
-    ]
+    target_missions = data["target_missions"]
 
     for mission in data["missions"]:
+        if mission["progress"] >= mission["goal"]:
+            continue
         mission_name = mission["name"].lower()
-        if "catch" in mission_name and "miss" not in mission_name and mission["progress"] < mission["goal"]:
-            if "tier" in mission_name:
-                match = re.search(r"tier\s+(\w)", mission_name)
-                if match:
-                    data["target_missions"].append(("tier", match.group(1)))
+        if "catch" not in mission_name or "miss" in mission_name:
+            continue
+
+        # "lower" is shared by the bst and weight checks, so it is only scanned once
+        has_lower = "lower" in mission_name
+
+        if "tier" in mission_name:
+            match = _MISSION_TIER_RE.search(mission_name)
+            if match:
+                target_missions.append(("tier", match.group(1)))
+                continue
+        if "bst" in mission_name:
+            match = _MISSION_NUMBER_RE.findall(mission_name)
+            if len(match) > 0:
+                if "greater" in mission_name or "higher" in mission_name:
+                    target_missions.append(("bst_greater", int(match[1])))
+                    continue
+                elif has_lower:
+                    target_missions.append(("bst_lower", int(match[1])))
+                    continue
+        if "kg" in mission_name:
+            match = _MISSION_KG_RE.search(mission_name)
+            if match:
+                if "more than" in mission_name or "heavier" in mission_name:
+                    target_missions.append(("weight_greater", int(match.group(1))))
+                    continue
+                elif "less than" in mission_name or has_lower:
+                    target_missions.append(("weight_lower", int(match.group(1))))
                     continue
-            if "bst" in mission_name:
-                match = re.findall(r"\d+", mission_name)
-                if len(match) > 0:
-                    if "greater" in mission_name or "higher" in mission_name:
-                        data["target_missions"].append(("bst_greater", int(match[1])))
-                        continue
-                    elif "lower" in mission_name:
-                        data["target_missions"].append(("bst_lower", int(match[1])))
-                        continue
-            if re.search(r"(\d+)\s*kg", mission_name):
-                match = re.search(r"(\d+)\s*kg", mission_name)
-                if match:
-                    if "more than" in mission_name or "heavier" in mission_name:
-                        data["target_missions"].append(("weight_greater", int(match.group(1))))
-                        continue
-                    elif "less than" in mission_name or "lower" in mission_name:
-                        data["target_missions"].append(("weight_lower", int(match.group(1))))
-                        continue
-            if "type" in mission_name and "mono" in mission_name:
-                data["target_missions"].append(("type_count", 1))
+        if "type" in mission_name:
+            if "mono" in mission_name:
+                target_missions.append(("type_count", 1))
                 continue
-            elif "type" in mission_name and "dual" in mission_name:
-                data["target_missions"].append(("type_count", 2))
+            elif "dual" in mission_name:
+                target_missions.append(("type_count", 2))
                 continue
-            for pokemon_type in pokemon_types:
-                if pokemon_type in mission_name:
-                    data["target_missions"].append(("type", pokemon_type))
-                    break
+        # One scan finds every type named in the mission, the list order decides between them
+        found_types = set(_MISSION_TYPE_RE.findall(mission_name))
+        if found_types:
+            pokemon_type = next(t for t in _MISSION_POKEMON_TYPES if t in found_types)
+            target_missions.append(("type", pokemon_type))
 
     return data
 
@@ -359,7 +545,8 @@ def handle_missions_data(server_data):
 def handle_pokedex_data(server_data):
     if server_data is None: return None
     return {
-        "dex": [{"name": item["name"], "pokedex_id": item["pokedexId"]} for item in server_data["dex"]],
+        # (lowercase name, pokedex_id) pairs, the only form the pokedex entries are read in
+        "dex_names": tuple((item["name"].lower(), item["pokedexId"]) for item in server_data["dex"]),
         "total_count": server_data["totalPkm"],
         "total_progress": server_data["progress"],
         "spawn_count": server_data["catchablePkm"],
@@ -369,26 +556,34 @@ def handle_pokedex_data(server_data):
 
 def handle_pokemon_data(server_data):
     if server_data is None: return None
-    def get_pokemon_types(type1, type2):
-        types = [type1, type2]
-        return list(filter(lambda x: x != "none" and x is not None, types))
-
+    content = server_data["content"]
+    base_stats = content["base_stats"]
     return {
-        "pokedex_id": server_data["content"]["pokedex_id"],
-        "name": server_data["content"]["name"],
-        "weight": server_data["content"]["weight"],
-        "types": get_pokemon_types(server_data["content"]["type1"], server_data["content"]["type2"]),
-        "tier": server_data["content"]["tier"],
-        "base_stats": sum(server_data["content"]["base_stats"].values()),
-        "base_hp": server_data["content"]["base_stats"]["hp"],
-        "base_speed": server_data["content"]["base_stats"]["speed"],
+        "pokedex_id": content["pokedex_id"],
+        "name": content["name"],
+        "weight": content["weight"],
+        "types": get_pokemon_types(content["type1"], content["type2"]),
+        "tier": content["tier"],
+        "base_stats": sum(base_stats.values()),
+        "base_hp": base_stats["hp"],
+        "base_speed": base_stats["speed"],
     }
 
 
+def parse_event_time(event_time):
+    """Parses an API ISO 8601 timestamp into local time"""
+    try:
+        # fromisoformat only accepts a trailing "Z" from Python 3.11
+        parsed = datetime.fromisoformat(event_time.replace("Z", "+00:00"))
+    except ValueError:
+        parsed = parser.isoparse(event_time)
+    return parsed.astimezone(_LOCAL_TZ)
+
+
 def handle_last_spawn_data(server_data):
     if server_data is None: return None
     return {
-        "spawn_date": parser.isoparse(server_data["event_time"]).astimezone(tz.tzlocal()),
+        "spawn_date": parse_event_time(server_data["event_time"]),
         "pokedex_id": server_data["pokedex_id"],
         "isEventSpawn": server_data.get("isEventSpawn", False)
     }
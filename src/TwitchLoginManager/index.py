@@ -1,9 +1,30 @@
 import asyncio
+import logging
+import random
 import time
 from os import getenv
+from src.helpers.BackgroundTasks import BackgroundTasks
 from src.helpers.BrowserService import BrowserService
 from assets.const.urls import TWITCH_URL, TWITCH_OAUTH_URL
 
+log = logging.getLogger(__name__)
+
+# Reload and capture attempts for one JWT refresh before the error is reported
+_REFRESH_ATTEMPTS = 4
+# Delay before the next attempt after a failed one, doubling per failure up to the cap
+_REFRESH_BACKOFF_BASE_S = 5.0
+_REFRESH_BACKOFF_CAP_S = 60.0
+# How often stream interruption overlays are looked for while a JWT capture is waiting
+_INTERRUPTION_CHECK_S = 5.0
+
+# Overlays that keep the stream, and with it the extension, from loading
+_INTERRUPTION_SELECTORS = (
+    '[data-a-target="player-overlay-mature-accept"]',
+    '[data-a-target="content-classification-gate-overlay-start-watching-button"]',
+    'button[aria-label="Start Watching"]',
+)
+_INTERRUPTION_BUTTON_TEXTS = ("Start Watching",)
+
 class TwitchLoginManager:
     """
     Manages Twitch login using Playwright via BrowserService asynchronously.
@@ -31,6 +52,7 @@ class TwitchLoginManager:
 
         self._login_task = None
         self._refresh_task = None
+        self._background_tasks = BackgroundTasks()
 
     def check_env_login(self):
         """Checks if login credentials are in environment variables"""
@@ -38,7 +60,7 @@ class TwitchLoginManager:
         oauth = getenv("TWITCH_OAUTH_TOKEN")
         jwt = getenv("TWITCH_POKEMON_JWT")
 
-        print(f"DEBUG: Enviroment Check - Username: {username}, OAuth: {'Found' if oauth else 'Missing'}, JWT: {'Found' if jwt else 'Missing'}")
+        log.debug("Enviroment Check - Username: %s, OAuth: %s, JWT: %s", username, 'Found' if oauth else 'Missing', 'Found' if jwt else 'Missing')
 
         if username and oauth:
             self._connection_status_callback({
@@ -61,44 +83,37 @@ class TwitchLoginManager:
     async def _run_browser_login(self):
         """Runs the browser login flow in a single async task."""
         try:
-            print("Starting Browser Login Flow...")
+            log.info("Starting Browser Login Flow...")
             await self.browser_service.login() 
             
-            print("Waiting for user to login...")
+            log.info("Waiting for user to login...")
             
-            logged_in = False
-            for _ in range(120): # Wait up to 2 minutes
-                if await self.browser_service.is_logged_in():
-                    logged_in = True
-                    break
-                await asyncio.sleep(1)
+            cookies = await self.browser_service.wait_for_login(timeout=120) # Wait up to 2 minutes
             
-            if not logged_in:
-                print("Login timed out or failed.")
+            if cookies is None:
+                log.warning("Login timed out or failed.")
                 self._connection_timeout_callback()
                 return
 
-            print("Login detected! Fetching credentials...")
+            log.info("Login detected! Fetching credentials...")
             self._login_success_callback()
             
-            print("Fetching Credentials from cookies...")
-            cookies = await self.browser_service.get_cookies()
-            username = next((c['value'] for c in cookies if c['name'] == 'name' or c['name'] == 'login'), "unknown_user")
-            
-            auth_token = next((c['value'] for c in cookies if c['name'] == 'auth-token'), None)
+            # The cookies that confirmed the login already hold the credentials
+            log.debug("Fetching Credentials from cookies...")
+            username, auth_token = find_login_cookies(cookies)
             
             env_oauth = getenv("TWITCH_OAUTH_TOKEN")
             if env_oauth:
-                print("Using OAuth token from env.")
+                log.info("Using OAuth token from env.")
                 final_oauth = env_oauth
             elif auth_token:
-                print("Using 'auth-token' cookie as OAuth token.")
+                log.info("Using 'auth-token' cookie as OAuth token.")
                 if not auth_token.startswith("oauth:"):
                     final_oauth = f"oauth:{auth_token}"
                 else:
                     final_oauth = auth_token
             else:
-                print("WARNING: No OAuth token found in Env or Cookies. Chat will likely fail.")
+                log.warning("No OAuth token found in Env or Cookies. Chat will likely fail.")
                 final_oauth = ""
             
             self._connection_status_callback({
@@ -107,8 +122,8 @@ class TwitchLoginManager:
             })
 
             target_channel = getenv("TWITCH_CHANNEL", getenv("TWITCH_USERNAME"))
-            print(f"Fetching Pokemon JWT from channel: {target_channel}...")
-            print("!!! PLEASE NAVIGATE TO THE TARGET CHANNEL IF NOT ALREADY THERE !!!")
+            log.info("Fetching Pokemon JWT from channel: %s...", target_channel)
+            log.info("!!! PLEASE NAVIGATE TO THE TARGET CHANNEL IF NOT ALREADY THERE !!!")
             
             jwt = await self.browser_service.capture_request_header(
                 navigate_url=None, 
@@ -117,109 +132,97 @@ class TwitchLoginManager:
                 timeout=60.0
             ) 
             
-            if not jwt:
-                jwt = await self.browser_service.capture_request_header(
-                    navigate_url=None,
-                    url_filter="poketwitch.bframework.de",
-                    header_name="Authorization",
-                    timeout=10.0
-                )
-                
             if jwt:
-                print("Captured JWT from request!")
+                log.info("Captured JWT from request!")
                 self._update_jwt_callback(jwt)
             else:
-                print("Could not capture JWT (timeout).")
+                log.warning("Could not capture JWT (timeout).")
 
         except Exception as e:
-            print(f"Browser Login Error: {e}")
+            log.error("Browser Login Error: %s", e)
             self._error_callback()
 
     def get_twitch_jwt(self):
-        """Called when JWT needs refresh."""
+        """
+        Called when JWT needs refresh.
+        Returns the refresh task, shared by every call made while it runs, which resolves to the new JWT or None.
+        """
         if self.check_env_login():
-            return
-            
-        print("Refreshing Pokemon JWT via Browser Reload...")
+            return None
         
         if self._refresh_task is None or self._refresh_task.done():
+            log.info("Refreshing Pokemon JWT via Browser Reload...")
             self._refresh_task = asyncio.create_task(self._refresh_jwt_background())
 
+        return self._refresh_task
+
     async def _refresh_jwt_background(self):
-        """Async task for refreshing JWT"""
-        try:
-            await self.browser_service.reload_page()
-            
-            jwt = await self._attempt_capture_jwt(timeout=45.0)
-            
-            if not jwt:
-                print("JWT Capture failed on first attempt. Checking for interruptions...")
-                clicked = await self._handle_stream_interruptions()
-                
-                if clicked:
-                    print("Interruption handled. Waiting for JWT again...")
-                    jwt = await self.browser_service.capture_request_header(
-                        navigate_url=None, 
-                        url_filter="poketwitch.bframework.de",
-                        header_name="authorization", 
-                        timeout=30.0
-                    )
-            
-            if not jwt:
-                 print("JWT Capture still failed. Retrying Reload (Attempt 2)...")
-                 await self.browser_service.reload_page()
-                 await asyncio.sleep(5)
-                 jwt = await self._attempt_capture_jwt(timeout=45.0)
+        """Async task for refreshing JWT, returns the captured JWT or None once every attempt failed"""
+        for attempt in range(1, _REFRESH_ATTEMPTS + 1):
+            try:
+                # The reload has already waited for the load event, the capture's own timeout covers the extension starting up
+                await self.browser_service.reload_page()
+                jwt = await self._capture_jwt_clearing_interruptions(timeout=45.0)
 
-            if jwt:
-                 print("Refreshed JWT captured!")
-                 self._update_jwt_callback(jwt)
-            else:
-                 print("Failed to capture Refreshed JWT after retries.")
-                 self._error_callback()
+                if jwt:
+                     log.info("Refreshed JWT captured!")
+                     self._update_jwt_callback(jwt)
+                     return jwt
 
-        except Exception as e:
-            print(f"Error refreshing JWT: {e}")
-            self._error_callback()
+                log.warning("JWT Capture failed (Attempt %d/%d).", attempt, _REFRESH_ATTEMPTS)
+
+            except Exception as e:
+                log.warning("Error refreshing JWT (Attempt %d/%d): %s", attempt, _REFRESH_ATTEMPTS, e)
+
+            if attempt < _REFRESH_ATTEMPTS:
+                backoff = min(_REFRESH_BACKOFF_CAP_S, _REFRESH_BACKOFF_BASE_S * 2 ** (attempt - 1))
+                backoff += random.uniform(0, _REFRESH_BACKOFF_BASE_S)
+                log.info("Waiting %.0fs before retrying the JWT refresh...", backoff)
+                await asyncio.sleep(backoff)
+
+        log.error("Failed to capture Refreshed JWT after retries.")
+        self._error_callback()
+        return None
 
     async def _attempt_capture_jwt(self, timeout):
-        """Helper to capture JWT with primary and fallback headers"""
-        jwt = await self.browser_service.capture_request_header(
+        """Helper to capture the JWT from the extension's authorization header"""
+        return await self.browser_service.capture_request_header(
              navigate_url=None,
              url_filter="poketwitch.bframework.de",
              header_name="authorization", 
              timeout=timeout
         )
-        if not jwt:
-            jwt = await self.browser_service.capture_request_header(
-                 navigate_url=None,
-                 url_filter="poketwitch.bframework.de",
-                 header_name="Authorization",
-                 timeout=10.0
-            )
-        return jwt
+
+    async def _capture_jwt_clearing_interruptions(self, timeout):
+        """Captures the JWT while clicking away stream interruptions, so an overlay does not hold it up until the timeout"""
+        capture_task = asyncio.create_task(self._attempt_capture_jwt(timeout=timeout))
+        watch_task = asyncio.create_task(self._watch_for_interruptions())
+        try:
+            return await capture_task
+        finally:
+            watch_task.cancel()
+            capture_task.cancel()
+
+    async def _watch_for_interruptions(self):
+        """Periodically clicks away stream interruptions until cancelled"""
+        while True:
+            await asyncio.sleep(_INTERRUPTION_CHECK_S)
+            try:
+                if await self._handle_stream_interruptions():
+                    log.info("Interruption handled. Waiting for JWT again...")
+            except Exception as e:
+                log.warning("Error checking stream interruptions: %s", e)
 
     async def _handle_stream_interruptions(self):
-        """Checks for common stream interruptions and clicks them via playwright."""
-        page = self.browser_service._page
-        if not page: return False
-        
-        clicked = False
-        interruption_selectors = [
-            '[data-a-target="player-overlay-mature-accept"]', 
-            '[data-a-target="content-classification-gate-overlay-start-watching-button"]',
-            'button[aria-label="Start Watching"]',
-            'button:has-text("Start Watching")'
-        ]
-        
-        for selector in interruption_selectors:
-            if await page.is_visible(selector):
-                print(f"Found interruption button: {selector}. Clicking...")
-                await page.click(selector)
-                clicked = True
-                await asyncio.sleep(2)
-        
-        return clicked
+        """Checks for common stream interruptions and clicks the first one found. Stacked overlays are left to the next check."""
+        clicked = await self.browser_service.click_first_visible(_INTERRUPTION_SELECTORS, _INTERRUPTION_BUTTON_TEXTS)
+
+        if clicked is None:
+            return False
+
+        log.info("Found interruption button: %s. Clicked.", clicked)
+        await asyncio.sleep(2)
+        return True
 
     def request_twitch_login(self):
         """User requested manual login."""
@@ -230,7 +233,25 @@ class TwitchLoginManager:
 
     def close_web(self):
         # Fallback if called synchronously
-        asyncio.create_task(self.close_web_async())
+        self._background_tasks.create(self.close_web_async())
         
     async def clear_cookies(self):
         await self.browser_service.clear_cookies()
+
+
+def find_login_cookies(cookies):
+    """Returns the first username and auth-token cookie values, in a single pass over the cookies"""
+    username = None
+    auth_token = None
+
+    for cookie in cookies:
+        name = cookie['name']
+        if username is None and (name == 'name' or name == 'login'):
+            username = cookie['value']
+        elif auth_token is None and name == 'auth-token':
+            auth_token = cookie['value']
+
+        if username is not None and auth_token is not None:
+            break
+
+    return (username if username is not None else "unknown_user"), auth_token
@@ -1,9 +1,19 @@
+import re
 import asyncio
+import logging
 import websockets
 from datetime import datetime
+from src.helpers.BackgroundTasks import BackgroundTasks
 from assets.const.pokemon_data import POKEMON_BOT_NAME
 from assets.const.urls import TWITCH_CHAT_SERVER, TWITCH_CHAT_PORT
 
+# ":sender!user@host PRIVMSG #channel :content", sender and content captured in one match
+_PRIVMSG_RE = re.compile(r"^:([^!]+)!\S+ PRIVMSG #\S+ :(.*)$")
+# The spawn announcement's 90 second catch window, as a whole number so "1905" or "900" do not count
+_SPAWN_WINDOW_RE = re.compile(r"\b90s?\b")
+
+log = logging.getLogger(__name__)
+
 class TwitchSocketManager:
     """
     Manages websocket connection to Twitch IRC.
@@ -25,39 +35,38 @@ class TwitchSocketManager:
         self._connected = False
         self._connected_channel = None
         self._listener_task = None
+        self._background_tasks = BackgroundTasks()
 
     def connect(self, user_data, channel_name):
         """Initiates websocket connection."""
-        print("Connecting socket (async).")
-        asyncio.create_task(self._connect_async(user_data, channel_name))
+        log.info("Connecting socket (async).")
+        self._background_tasks.create(self._connect_async(user_data, channel_name))
 
     async def _connect_async(self, user_data, channel_name):
         uri = "wss://irc-ws.chat.twitch.tv:443"
         try:
-            self._ws = await websockets.connect(uri)
+            # IRC lines are tiny, deflating them costs more than it saves
+            self._ws = await websockets.connect(uri, compression=None)
             
-            # Send Auth
-            await self._ws.send(f"PASS {user_data.oauth}")
-            await self._ws.send(f"NICK {user_data.username}")
-            await self._ws.send(f"JOIN #{channel_name}")
+            # Send Auth, pipelined as CRLF separated lines in a single frame
+            await self._ws.send(f"PASS {user_data.oauth}\r\nNICK {user_data.username}\r\nJOIN #{channel_name}")
             
             # Wait for successful connection (End of /NAMES)
-            loading = True
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 30.0
             
             try:
-                # Wait up to 30 seconds for auth
-                while loading:
-                    msg = await asyncio.wait_for(self._ws.recv(), timeout=30.0)
-                    for line in msg.split('\r\n'):
-                        if "End of /NAMES list" in line:
-                            loading = False
-                            break
-                        elif "Login authentication failed" in line:
-                            print("Twitch authentication failed.")
-                            await self._on_disconnect_async()
-                            return
+                # Wait up to 30 seconds for auth in total, however many frames arrive meanwhile
+                while True:
+                    msg = await asyncio.wait_for(self._ws.recv(), timeout=deadline - loop.time())
+                    if "End of /NAMES list" in msg:
+                        break
+                    if "Login authentication failed" in msg:
+                        log.error("Twitch authentication failed.")
+                        await self._on_disconnect_async()
+                        return
             except asyncio.TimeoutError:
-                 print("Twitch auth timeout.")
+                 log.error("Twitch auth timeout.")
                  await self._on_disconnect_async()
                  return
                  
@@ -70,18 +79,18 @@ class TwitchSocketManager:
             self._listener_task = asyncio.create_task(self._receive_messages())
 
         except Exception as error:
-            print("Socket connection error:\n", error)
+            log.error("Socket connection error:\n %s", error)
             # Call error callback via event loop or directly if threadsafe
             self._error_callback()
 
     def _on_connect(self):
-        print("Socket connected.")
+        log.info("Socket connected.")
         self._connection_callback()
 
     def disconnect(self):
         """Closes the websocket connection."""
         if self._connected:
-             asyncio.create_task(self._on_disconnect_async())
+             self._background_tasks.create(self._on_disconnect_async())
 
     async def _on_disconnect_async(self):
         """Async disconnection logic."""
@@ -104,31 +113,31 @@ class TwitchSocketManager:
         try:
             while self._connected and self._ws:
                 msg = await self._ws.recv()
+
+                # Most frames are chat from other users, only PINGs and the bot's lines are worth splitting
+                if POKEMON_BOT_NAME not in msg and 'PING' not in msg:
+                    continue
                 
                 for line in msg.split('\r\n'):
                     if not line: continue
                     
-                    # Ping pong
+                    # Ping pong, echoing the PING's token as RFC 1459 asks
                     if line.startswith('PING'):
-                        await self._ws.send('PONG :tmi.twitch.tv')
+                        await self._ws.send('PONG' + line[4:])
                         continue
                         
-                    if 'PRIVMSG' in line and POKEMON_BOT_NAME in line:
-                        parts = line.split(':', 2)
-                        try:
-                            sender = parts[1].split('!', 1)[0]
-                            content = parts[2]
-                            self._process_message(sender, content)
-                        except IndexError:
-                            print("Index Error:", line)
+                    if POKEMON_BOT_NAME in line:
+                        match = _PRIVMSG_RE.match(line)
+                        if match:
+                            self._process_message(match.group(1), match.group(2))
                             
         except websockets.ConnectionClosed:
-             print("Websocket connection closed by server.")
+             log.warning("Websocket connection closed by server.")
              await self._on_disconnect_async()
         except asyncio.CancelledError:
              pass
         except Exception as error:
-             print("Socket error: ", error)
+             log.error("Socket error: %s", error)
              await self._on_disconnect_async()
 
     def _process_message(self, sender, message):
@@ -136,20 +145,20 @@ class TwitchSocketManager:
         if sender != POKEMON_BOT_NAME:
             return
 
-        if "!pokecatch" in message and "90" in message:
+        if "!pokecatch" in message and _SPAWN_WINDOW_RE.search(message):
             self._poke_spawn_callback(message)
 
     def send_chat_message(self, message):
         """Sends a message in chat. Fires and forgets task."""
         if self._connected and self._connected_channel is not None and self._ws:
-             asyncio.create_task(self._send_chat_message_async(message))
+             self._background_tasks.create(self._send_chat_message_async(message))
              
     async def _send_chat_message_async(self, message):
         try:
             message_temp = f'PRIVMSG #{self._connected_channel} :{message}'
             await self._ws.send(message_temp)
         except Exception as e:
-            print(f"Failed to send message: {e}")
+            log.error("Failed to send message: %s", e)
 
     @property
     def connected(self):
@@ -0,0 +1,30 @@
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """
+
+    A set of fire-and-forget asyncio tasks.
+    Keeps each task referenced until it finishes, so it cannot be garbage collected mid-flight,
+    and logs failures that would otherwise go unnoticed.
+    """
+
+    __slots__ = ("_tasks",)
+
+    def __init__(self):
+        self._tasks = set()
+
+    def create(self, coro):
+        """Starts a task for the coroutine and tracks it until it is done"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error("Background task failed: %r", task.exception())
@@ -1,24 +1,112 @@
-import json
 import os
 import asyncio
-import sys
+import logging
+import re
 from playwright.async_api import async_playwright
+from src.helpers.BackgroundTasks import BackgroundTasks
+from assets.const.urls import TWITCH_URL
 
-# Force unbuffered stdout
-sys.stdout.reconfigure(line_buffering=True)
+log = logging.getLogger(__name__)
+
+# Response bodies read and handled at once, a burst of responses queues behind these
+_MAX_CONCURRENT_PARSES = 16
+
+# How a response listener receives the body: parsed JSON, text, or the unread response itself
+_RESPONSE_PARSE_MODES = ("json", "text", "none")
+
+# The Pokemon extension's id, found in its frame url
+_EXTENSION_ID = "pm0qkv9g4h87t5y6lg329oam8j7ze9"
+# How long a fetch waits for a lazily loaded extension frame to show up
+_EXTENSION_FRAME_TIMEOUT_S = 5.0
+
+# Static asset responses, by extension of the url path
+_ASSET_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".css", ".js", ".svg", ".ico", ".woff", ".woff2")
+
+# Installed in every page before its own scripts run, to hide the automation markers
+_STEALTH_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ?
+    Promise.resolve({ state: 'denied' }) :
+    Promise.resolve({ state: 'granted' })
+);
+const spoofedWebGLParameters = {
+    37445: 'Google Inc. (NVIDIA)',
+    37446: 'ANGLE (NVIDIA, NVIDIA GeForce RTX 3060/PCIe/SSE2, OpenGL 4.5.0)',
+};
+const getParameter = WebGLRenderingContext.prototype.getParameter;
+WebGLRenderingContext.prototype.getParameter = function(parameter) {
+    const spoofed = spoofedWebGLParameters[parameter];
+    return spoofed !== undefined ? spoofed : getParameter.call(this, parameter);
+};
+"""
+
+# GET fetch run inside the extension frame, errors come back as status 0
+_FRAME_FETCH_SCRIPT = """
+async ({url, headers}) => {
+    try {
+        const res = await fetch(url, {
+            method: "GET",
+            headers: headers
+        });
+        const text = await res.text();
+        return {
+            status: res.status,
+            text: text,
+            headers: {}
+        };
+    } catch (e) {
+        return {
+            status: 0,
+            text: "JS Error: " + e.name + ": " + e.message
+        };
+    }
+}
+"""
+
+# Clicks the first visible match in the page, returning what was clicked or null
+_CLICK_FIRST_VISIBLE_SCRIPT = """
+([selectors, buttonTexts]) => {
+    const isVisible = (el) => el.getClientRects().length > 0;
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        if (el && isVisible(el)) {
+            el.click();
+            return selector;
+        }
+    }
+    for (const text of buttonTexts) {
+        const el = Array.from(document.querySelectorAll("button")).find(b => isVisible(b) && b.textContent.includes(text));
+        if (el) {
+            el.click();
+            return `button with text "${text}"`;
+        }
+    }
+    return null;
+}
+"""
 
 class BrowserService:
     def __init__(self, state_file="browser_state.json"):
         self.state_file = state_file
         self._is_running = False
+        # Set when the login state may have changed since the state file was last written
+        self._state_dirty = not os.path.exists(state_file)
         
         # Internal state
         self._playwright = None
         self._browser = None
         self._context = None
         self._page = None
+        self._cdp = None # CDP session of the page, kept for the browser's lifetime
         
-        self._response_listeners = [] # List of (url_filter, callback)
+        self._response_listeners = [] # List of (url_filter, callback, parse)
+        self._listener_filter_re = None # Every listener's url_filter as one alternation, None without listeners
+        self._background_tasks = BackgroundTasks()
+        self._parse_slots = asyncio.Semaphore(_MAX_CONCURRENT_PARSES)
 
     async def start(self):
         """Starts the async browser."""
@@ -40,17 +128,63 @@ class BrowserService:
             await self.start()
         if self._page:
             await self._page.goto(url)
+        self._state_dirty = True
         return "Page Opened"
 
     async def is_logged_in(self):
         """Checks login status."""
+        return await self._get_login_cookies() is not None
+
+    async def _get_login_cookies(self):
+        """Returns the Twitch cookies when they hold a login auth-token, otherwise None"""
         if not self._context:
-            return False
-        cookies = await self._context.cookies()
+            return None
+        # Only Twitch's cookies cross the driver boundary, not the whole jar
+        cookies = await self._context.cookies(TWITCH_URL)
         for c in cookies:
              if c['name'] == 'auth-token' and c['value']:
-                return True
-        return False
+                return cookies
+        return None
+
+    async def wait_for_login(self, timeout=120):
+        """
+        Waits until the login cookie is set, checking cookies only after browser activity.
+        Returns the cookies read at login, or None on timeout.
+        """
+        cookies = await self._get_login_cookies()
+        if cookies is not None or not self._context:
+            return cookies
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        activity = asyncio.Event()
+
+        def on_activity(_):
+            activity.set()
+
+        # Login cookies arrive with a response or a navigation, so those are the moments worth checking
+        self._context.on("response", on_activity)
+        if self._page:
+            self._page.on("framenavigated", on_activity)
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                try:
+                    # Bounded wait, so a cookie set without any event is still noticed
+                    await asyncio.wait_for(activity.wait(), timeout=min(remaining, 5))
+                except asyncio.TimeoutError:
+                    pass
+                activity.clear()
+
+                cookies = await self._get_login_cookies()
+                if cookies is not None:
+                    return cookies
+        finally:
+            self._context.remove_listener("response", on_activity)
+            if self._page:
+                self._page.remove_listener("framenavigated", on_activity)
 
     async def fetch_api(self, url, method="GET", headers=None, body=None):
         """Executes API fetch via APIRequest Context (Headless request)."""
@@ -75,65 +209,66 @@ class BrowserService:
         if not self._page:
              return {"status": 500, "text": "No Page"}
 
-        # Scroll down to ensure lazy-loaded extensions are triggered
-        try:
-            await self._page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await self._page.wait_for_timeout(2000) # Increased wait time
-        except:
-             pass
-
-        target_frame = None
-        frames_debug = []
-        for frame in self._page.frames:
-            frames_debug.append(frame.url)
-            # Match the extension ID or domain
-            if "pm0qkv9g4h87t5y6lg329oam8j7ze9" in frame.url:
-                target_frame = frame
-                break
+        target_frame = self._find_extension_frame()
+        if target_frame is None:
+            # Scroll down to ensure lazy-loaded extensions are triggered, then wait for the frame to load
+            try:
+                await self._page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                target_frame = await self._wait_for_extension_frame(_EXTENSION_FRAME_TIMEOUT_S)
+            except:
+                 pass
         
         if not target_frame:
-             print("Extension frame not found!")
-             print("Found frames:", frames_debug)
+             frames_debug = [frame.url for frame in self._page.frames]
+             log.warning("Extension frame not found! Found frames: %s", frames_debug)
              return {"status": 404, "text": f"Frame not found. Visible frames: {len(frames_debug)}"}
             
-        # Serialize headers
-        headers_js = json.dumps(headers) if headers else "{}"
-        
-        script = f"""
-        async () => {{
-            try {{
-                const res = await fetch("{url}", {{
-                    method: "GET",
-                    headers: {headers_js}
-                }});
-                const text = await res.text();
-                return {{
-                    status: res.status,
-                    text: text,
-                    headers: {{}} 
-                }};
-            }} catch (e) {{
-                return {{
-                    status: 0,
-                    text: "JS Error: " + e.name + ": " + e.message
-                }};
-            }}
-        }}
-        """
         try:
             # We use target_frame.evaluate to run inside that specific frame context
-            result = await target_frame.evaluate(script)
+            # url and headers travel as evaluate arguments, the script itself never changes
+            result = await target_frame.evaluate(_FRAME_FETCH_SCRIPT, {"url": url, "headers": headers or {}})
             if result["status"] == 0:
-                print(f"In-Frame Fetch JS Error: {result['text']}")
+                log.error("In-Frame Fetch JS Error: %s", result['text'])
             return result
         except Exception as e:
-            print(f"Frame evaluate error: {e}")
+            log.error("Frame evaluate error: %s", e)
             return None
 
+    def _find_extension_frame(self):
+        """Returns the Pokemon extension frame when it is loaded, otherwise None"""
+        for frame in self._page.frames:
+            # Match the extension ID or domain
+            if _EXTENSION_ID in frame.url:
+                return frame
+        return None
+
+    async def _wait_for_extension_frame(self, timeout):
+        """Waits for the Pokemon extension frame to navigate to its url, returning None on timeout"""
+        frame_loaded = asyncio.Event()
+
+        def on_frame_navigated(frame):
+            if _EXTENSION_ID in frame.url:
+                frame_loaded.set()
+
+        self._page.on("framenavigated", on_frame_navigated)
+        try:
+            # It may have loaded before the listener was attached
+            target_frame = self._find_extension_frame()
+            if target_frame is None:
+                try:
+                    await asyncio.wait_for(frame_loaded.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    return None
+                target_frame = self._find_extension_frame()
+            return target_frame
+        finally:
+            self._page.remove_listener("framenavigated", on_frame_navigated)
+
     async def clear_cookies(self):
         """Clears cookies."""
         if self._context:
             await self._context.clear_cookies()
+            self._state_dirty = True
         
     async def get_cookies(self):
         return await self._context.cookies() if self._context else []
@@ -156,6 +291,15 @@ class BrowserService:
         if self._page:
             await self._page.reload()
 
+    async def click_first_visible(self, selectors, button_texts=()):
+        """
+        Clicks the first visible element matching one of the CSS `selectors`, or else a button containing one of `button_texts`.
+        Runs as a single page evaluation. Returns the clicked target, or None when nothing matched.
+        """
+        if not self._page:
+            return None
+        return await self._page.evaluate(_CLICK_FIRST_VISIBLE_SCRIPT, [list(selectors), list(button_texts)])
+
     async def wait_for_selector(self, selector, timeout=10000):
         if self._page:
             await self._page.wait_for_selector(selector, timeout=timeout)
@@ -163,40 +307,48 @@ class BrowserService:
     async def capture_request_header(self, navigate_url, url_filter, header_name, timeout=20):
         """
         Navigates to a URL and waits for a request matching `url_filter`.
-        Returns the value of `header_name` from that request.
+        Returns the value of `header_name` from that request, matched case-insensitively.
         """
         found_value = None
         event_match = asyncio.Event()
+        # Playwright reports request header names in lower case
+        header_key = header_name.lower()
 
         async def handle_request(request):
             nonlocal found_value
-            if url_filter in request.url and header_name in request.headers:
-                found_value = request.headers[header_name]
-                event_match.set()
+            if url_filter in request.url:
+                headers = request.headers
+                if header_key in headers:
+                    found_value = headers[header_key]
+                    event_match.set()
 
         self._page.on("request", handle_request)
         try:
             if navigate_url:
-                print(f"Navigating to {navigate_url} to capture {header_name}...")
+                log.info("Navigating to %s to capture %s...", navigate_url, header_name)
                 await self._page.goto(navigate_url)
             else:
-                print(f"Waiting for request match on current page ({url_filter})...")
+                log.info("Waiting for request match on current page (%s)...", url_filter)
             
             try:
                 await asyncio.wait_for(event_match.wait(), timeout=timeout)
                 return found_value
             except asyncio.TimeoutError:
-                print(f"Timeout waiting for {url_filter}")
+                log.warning("Timeout waiting for %s", url_filter)
                 return None
         finally:
             self._page.remove_listener("request", handle_request)
 
-    def add_response_listener(self, url_filter, callback):
+    def add_response_listener(self, url_filter, callback, parse="json"):
         """
         Registers a callback for responses matching the filter.
-        callback is an async function: async def callback(url, response_json)
+        callback is an async function: async def callback(url, body)
+        `parse` picks the body: "json" (parsed), "text", or "none" for the unread response, so the callback reads only what it needs.
         """
-        self._response_listeners.append((url_filter, callback))
+        if parse not in _RESPONSE_PARSE_MODES:
+            raise ValueError(f"Unknown response parse mode: {parse}")
+        self._response_listeners.append((url_filter, callback, parse))
+        self._listener_filter_re = re.compile("|".join(re.escape(f) for f, _, _ in self._response_listeners))
 
     # --- Internal Implementation Methods ---
 
@@ -236,7 +388,7 @@ class BrowserService:
         try:
             self._context = await self._playwright.chromium.launch_persistent_context(user_data_dir, **kwargs)
         except Exception:
-            print("Chrome not found, falling back to bundled Chromium...")
+            log.info("Chrome not found, falling back to bundled Chromium...")
             if "channel" in kwargs:
                 del kwargs["channel"]
             self._context = await self._playwright.chromium.launch_persistent_context(user_data_dir, **kwargs)
@@ -247,38 +399,29 @@ class BrowserService:
             self._page = await self._context.new_page()
 
         try:
-            client = await self._context.new_cdp_session(self._page)
-            await client.send("Network.setCacheDisabled", {"cacheDisabled": True})
-            print("Browser Cache Disabled via CDP")
+            self._cdp = await self._context.new_cdp_session(self._page)
+            await self._cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+            log.debug("Browser Cache Disabled via CDP")
         except Exception as e:
-            print(f"Failed to setup CDP: {e}")
+            log.warning("Failed to setup CDP: %s", e)
 
         self._context.on("response", self._handle_response_event)
         
-        stealth_script = """
-        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-        Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-        Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-        const originalQuery = window.navigator.permissions.query;
-        window.navigator.permissions.query = (parameters) => (
-            parameters.name === 'notifications' ?
-            Promise.resolve({ state: 'denied' }) :
-            Promise.resolve({ state: 'granted' })
-        );
-        const getParameter = WebGLRenderingContext.prototype.getParameter;
-        WebGLRenderingContext.prototype.getParameter = function(parameter) {
-            if (parameter === 37445) return 'Google Inc. (NVIDIA)';
-            if (parameter === 37446) return 'ANGLE (NVIDIA, NVIDIA GeForce RTX 3060/PCIe/SSE2, OpenGL 4.5.0)';
-            return getParameter(parameter);
-        };
-        """
-        await self._context.add_init_script(stealth_script)
+        await self._context.add_init_script(_STEALTH_SCRIPT)
 
     async def _stop_internal(self):
-        if self._context:
+        if self._cdp:
             try:
-                await self._context.storage_state(path=self.state_file)
+                await self._cdp.detach()
             except: pass
+            self._cdp = None
+        if self._context:
+            # The profile directory already persists the session, the state file is only rewritten after a login or cookie change
+            if self._state_dirty:
+                try:
+                    await self._context.storage_state(path=self.state_file)
+                    self._state_dirty = False
+                except: pass
             try:
                 await self._context.close()
             except: pass
@@ -289,24 +432,36 @@ class BrowserService:
 
     # --- Helper ---
     def _is_asset_url(self, url):
-        return any(url.endswith(ext) for ext in [".png", ".jpg", ".jpeg", ".webp", ".gif", ".css", ".js", ".svg", ".ico", ".woff", ".woff2"])
+        # Query string dropped, then a single C-level endswith over every extension
+        return url.partition("?")[0].lower().endswith(_ASSET_EXTENSIONS)
 
     def _handle_response_event(self, response):
         try:
             url = response.url
-            for url_filter, callback in self._response_listeners:
-                if url_filter in url:
-                    if self._is_asset_url(url):
-                         continue
-                    if response.status == 200:
-                        # Schedule coroutine execution
-                        asyncio.create_task(self._parse_and_call(response, callback, url))
+            # One C-level scan turns away the responses no listener wants, which is nearly all of them
+            if self._listener_filter_re is None or self._listener_filter_re.search(url) is None:
+                return
+
+            listeners = [(callback, parse) for url_filter, callback, parse in self._response_listeners if url_filter in url]
+            # Decided once per response, not once per matching listener
+            if response.status != 200 or self._is_asset_url(url):
+                return
+
+            for callback, parse in listeners:
+                # Schedule coroutine execution
+                self._background_tasks.create(self._parse_and_call(response, callback, parse, url))
         except Exception as e:
-            print(f"Error in handle_response_event: {e}", file=sys.stderr, flush=True)
+            log.error("Error in handle_response_event: %s", e)
 
-    async def _parse_and_call(self, response, callback, url):
-        try:
-            json_data = await response.json()
-            await callback(url, json_data)
-        except Exception:
-            pass
+    async def _parse_and_call(self, response, callback, parse, url):
+        async with self._parse_slots:
+            try:
+                if parse == "json":
+                    body = await response.json()
+                elif parse == "text":
+                    body = await response.text()
+                else:
+                    body = response
+                await callback(url, body)
+            except Exception:
+                pass
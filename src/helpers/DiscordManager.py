@@ -1,12 +1,34 @@
+import logging
+import queue
 import requests
 from threading import Thread
 
+log = logging.getLogger(__name__)
+
+# Embed color per tier, Blurple for the rest
+_TIER_COLORS = {
+    "S": 0xFFD700, # Gold
+    "A": 0x800080, # Purple
+    "B": 0x0000FF, # Blue
+}
+_DEFAULT_COLOR = 0x7289DA
+
+# Notifications waiting to be sent, a burst beyond this is dropped instead of piling up behind Discord's rate limit
+_MAX_PENDING_NOTIFICATIONS = 64
+# Seconds to wait for Discord, so a stalled request cannot hold up the notifications queued behind it
+_WEBHOOK_TIMEOUT_S = 10
+
 class DiscordManager:
     """
     Manages Discord Webhook notifications for high-tier Pokemon spawns.
     """
     def __init__(self, config_manager):
         self.config_manager = config_manager
+        # One long lived sender thread posts the webhooks in order instead of a new thread per notification
+        self._pending = queue.Queue(maxsize=_MAX_PENDING_NOTIFICATIONS)
+        # Keeps the connection to Discord alive between notifications, only used from the sender thread
+        self._session = requests.Session()
+        Thread(target=self._sender_loop, name="discord-webhook", daemon=True).start()
 
     @property
     def enabled(self):
@@ -27,8 +49,16 @@ class DiscordManager:
         if not self.enabled or not self.webhook_url:
             return
 
-        # Run in a separate thread to avoid blocking game logic
-        Thread(target=self._send_notification_thread, args=(pokemon_data,)).start()
+        # Queued for the sender thread to avoid blocking game logic
+        try:
+            self._pending.put_nowait(pokemon_data)
+        except queue.Full:
+            log.warning("Discord notification dropped, too many pending.")
+
+    def _sender_loop(self):
+        """Sends queued notifications one at a time, for the lifetime of the program"""
+        while True:
+            self._send_notification_thread(self._pending.get())
 
     def _send_notification_thread(self, p_data):
         try:
@@ -36,13 +66,7 @@ class DiscordManager:
             tier = p_data.get("tier", "Unknown")
             
             # Basic Color Coding
-            color = 0x7289DA # Blurple default
-            if tier == "S":
-                color = 0xFFD700 # Gold
-            elif tier == "A":
-                color = 0x800080 # Purple
-            elif tier == "B":
-                color = 0x0000FF # Blue
+            color = _TIER_COLORS.get(tier, _DEFAULT_COLOR)
             
             # Construct Embed
             embed = {
@@ -76,9 +100,9 @@ class DiscordManager:
             if self.ping_user:
                 payload["content"] = "@everyone A high tier pokemon has spawned!"
 
-            response = requests.post(self.webhook_url, json=payload)
+            response = self._session.post(self.webhook_url, json=payload, timeout=_WEBHOOK_TIMEOUT_S)
             if response.status_code not in [200, 204]:
-                print(f"Discord Webhook Failed: {response.status_code} - {response.text}")
+                log.warning("Discord Webhook Failed: %s - %s", response.status_code, response.text)
 
         except Exception as e:
-            print(f"Error sending Discord notification: {e}")
+            log.error("Error sending Discord notification: %s", e)
@@ -1,6 +1,9 @@
 from base64 import urlsafe_b64decode
 from datetime import datetime
 from json import loads
+import logging
+
+log = logging.getLogger(__name__)
 
 
 class PokeJwt:
@@ -10,6 +13,8 @@ class PokeJwt:
     Contains raw JWT string and expiration date.
     """
 
+    __slots__ = ("_exp", "_jwt", "_user_id")
+
     def __init__(self, encoded_jwt):
         if encoded_jwt.startswith("v4.local"):
             raise ValueError("Invalid JWT: You stuck the 'Integrity Token' (starts with v4.local) instead of the JWT. The JWT must start with 'eyJ'. Please check GETTING_OAUTH.md again.")
@@ -24,12 +29,12 @@ class PokeJwt:
             if missing_padding:
                 payload += '=' * (4 - missing_padding)
             
-            payload_decoded = urlsafe_b64decode(payload).decode("utf-8")
+            # json reads the UTF-8 bytes directly, no intermediate str
+            payload_dict = loads(urlsafe_b64decode(payload))
         except Exception as e:
-            print(f"Error decoding JWT payload: {e}")
-            print(f"Raw payload (masked): {payload[:5]}...{payload[-5:]}")
+            log.error("Error decoding JWT payload: %s", e)
+            log.error("Raw payload (masked): %s...%s", payload[:5], payload[-5:])
             raise e
-        payload_dict = loads(payload_decoded)
         expiration_datetime = datetime.fromtimestamp(payload_dict["exp"])
 
         self._exp = expiration_datetime
@@ -2,8 +2,20 @@ import time
 import uuid
 import hmac
 import hashlib
+from functools import lru_cache
 from urllib.parse import urlparse
 
+# 1. Constants found in the JS file
+_SECRET_PART_1 = "d4o3"
+_SECRET_PART_2 = "2t5X"
+_SECRET_KEY = f"{_SECRET_PART_1}n{_SECRET_PART_2}".encode('utf-8')  # d4o3n2t5X
+
+
+@lru_cache(maxsize=256)
+def _url_path(base_url):
+    """Path of a url without query string, cached since the API endpoints repeat"""
+    return urlparse(base_url).path
+
 class SignatureHelper:
     """
     Helper class to generate signatures for PCG API requests.
@@ -24,11 +36,6 @@ class SignatureHelper:
             dict: A dictionary containing the necessary headers.
         """
         
-        # 1. Constants found in the JS file
-        secret_part_1 = "d4o3"
-        secret_part_2 = "2t5X"
-        secret = f"{secret_part_1}n{secret_part_2}"  # d4o3n2t5X
-        
         # 2. Prepare dynamic values
         # The game calculates timestamp as: Math.floor(Date.now()/1e3) + serverOffset
         # We assume local clock is correct. If strict usage fails, we might need NTP or server offset.
@@ -42,7 +49,8 @@ class SignatureHelper:
         # This handles absolute URLs correctly.
         # Example: https://poketwitch.bframework.de/api/game/ext/trainer/pokedex/info/v2/?pokedex_id=354
         # Path: /api/game/ext/trainer/pokedex/info/v2/
-        path = urlparse(full_url).path
+        # The query string never reaches the path, so it is dropped before the cached parse
+        path = _url_path(full_url.partition("?")[0])
         
         # 3. Construct the "Message" to sign
         # Logic from JS: `${UserID}:${Timestamp}X${Path}:${Nonce}`
@@ -56,12 +64,12 @@ class SignatureHelper:
         
         #print(f"DEBUG SIGNATURE GEN:")
         #print(f"  Inputs: UserID={twitch_user_id}, Time={timestamp}, Path={path}, Nonce={nonce}")
-        #print(f"  Secret: {secret}")
+        #print(f"  Secret: {_SECRET_KEY}")
         #print(f"  Message: {message}")
         
         # 4. Generate Signature (HMAC-SHA256)
         signature = hmac.new(
-            secret.encode('utf-8'),
+            _SECRET_KEY,
             message.encode('utf-8'),
             hashlib.sha256
         ).hexdigest()
@@ -70,17 +78,6 @@ class SignatureHelper:
         
         # 5. Return the headers
         return {
-            "Authorization": f"Bearer {auth_token}", # Assuming standard Bearer format (JS might send raw token in Authorization?? No, likely Bearer)
-            # WAIT. JS sends: headers.Authorization = ... (depends on Axios default).
-            # Usually axios defaults Authorization to whatever is set in `defaults.headers.common`.
-            # But specific endpoints might override.
-            # My 'PokemonData' sends raw token in 'Authorization'.
-            # I will stick to what `PokemonData` used before unless proven otherwise.
-            # Actually catch: `old_headers` used `self._poke_jwt.jwt` (Raw).
-            # If I put "Bearer " here, it might break if serve expects raw.
-            # BUT standard OAuth is usually Bearer.
-            # Let's check `PokemonData` usage.
-            # In `PokemonData.py`, it constructs headers with `self._poke_jwt.jwt`.
             "Authorization": auth_token, # Send RAW token as seen in JS (W.defaults.headers.common.Authorization = L.value)
             "signature": signature,
             "timestamp": timestamp,
@@ -5,9 +5,13 @@ class UserData:
     Contains raw username string and oAuth code.
     """
 
+    __slots__ = ("_username", "_oauth", "_raw", "_key")
+
     def __init__(self, user_data):
         self._username = user_data["username"]
         self._oauth = user_data["oauth"]
+        self._raw = dict(user_data)
+        self._key = (self._username, self._oauth)
 
     @property
     def username(self):
@@ -16,3 +20,11 @@ class UserData:
     @property
     def oauth(self):
         return self._oauth
+
+    @property
+    def raw(self):
+        return self._raw
+
+    @property
+    def key(self):
+        return self._key
@@ -11,4 +11,15 @@ new QWebChannel(qt.webChannelTransport, function (channel) {
 });
 
 
-const handleSaveConfig = (newConfig) => backend_channel.save_config(newConfig)
+// Every save carries the whole config, so rapid saves are coalesced and only the latest one crosses the channel
+const SAVE_CONFIG_DEBOUNCE_MS = 200;
+let pendingSaveConfig = null;
+
+const handleSaveConfig = (newConfig) => {
+    if (pendingSaveConfig !== null) clearTimeout(pendingSaveConfig);
+
+    pendingSaveConfig = setTimeout(() => {
+        pendingSaveConfig = null;
+        backend_channel.save_config(newConfig);
+    }, SAVE_CONFIG_DEBOUNCE_MS);
+}